@@ -0,0 +1,29 @@
+'''
+Measures the time of importing smartcli and creating a Cli in a fresh interpreter, the best of a few runs.
+Run from the repository root: python -m benchmarks.importBenchmark
+'''
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+CODE = 'import json, time\nstart = time.perf_counter()\nfrom smartcli import Cli\nCli()\nprint(json.dumps((time.perf_counter() - start) * 1000))'
+
+
+def measure(runs: int) -> float:
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (os.getcwd(), env.get('PYTHONPATH'))))
+    run = lambda: json.loads(subprocess.run([sys.executable, '-c', CODE], env=env, capture_output=True, text=True, check=True).stdout)
+    run()  # compiles the modules, so only the import is measured
+    return min(run() for _ in range(runs))
+
+
+def main():
+    print(f'import and Cli(): {measure(10):.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
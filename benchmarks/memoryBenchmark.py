@@ -0,0 +1,43 @@
+'''
+Measures the memory taken by the elements of large generated trees.
+Run from the repository root: python -m benchmarks.memoryBenchmark
+'''
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+from smartcli import Cli
+
+
+def create_cli(nodes: int, flags: int) -> Cli:
+    cli = Cli()
+    root = cli.root
+    for i in range(nodes):
+        node = root.add_node(f'cmd{i}')
+        for j in range(flags):
+            node.add_flag(f'--flag{j}', f'-{j}')
+        node.set_possible_param_order('src dst')
+    return cli
+
+
+def measure(nodes: int, flags: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    cli = create_cli(nodes, flags)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cli
+    return size
+
+
+def main():
+    print(f'{"nodes":>8} {"flags":>6} {"elements":>9} {"total (MB)":>11} {"per element (B)":>16}')
+    for nodes, flags in ((1000, 2), (10000, 2), (10000, 5)):
+        elements = nodes * (1 + flags + 2)
+        size = measure(nodes, flags)
+        print(f'{nodes:>8} {flags:>6} {elements:>9} {size / 2 ** 20:>11.1f} {size / elements:>16.0f}')
+
+
+if __name__ == '__main__':
+    main()
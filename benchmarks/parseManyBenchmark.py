@@ -0,0 +1,65 @@
+'''
+Compares parsing a batch of command lines with Cli.parse_many, in this process and in a pool of processes,
+against calling Cli.parse in a loop.
+Run from the repository root: python -m benchmarks.parseManyBenchmark
+'''
+from __future__ import annotations
+
+import os
+import random
+from functools import partial
+from time import perf_counter
+
+from smartcli import Cli
+
+
+def create_cli(commands: int) -> Cli:
+    cli = Cli()
+    root = cli.root
+    root.add_flag('--verbose', '-v')
+    for i in range(commands):
+        node = root.add_node(f'cmd{i}', f'c{i}')
+        node.add_flag('--force', '-f')
+        node.add_flag('--output', '-o', flag_limit=1)
+        node.set_possible_param_order('src dst')
+        node.add_action(lambda src, dst: (src, dst))
+    return cli
+
+
+def create_args(commands: int, count: int) -> list[list[str]]:
+    rng = random.Random(0)
+    return [['prog', f'cmd{rng.randrange(commands)}', 'a', '-o', 'out', 'b', '-f'] for _ in range(count)]
+
+
+def measure(commands: int, count: int) -> tuple[float, float, float]:
+    args_list = create_args(commands, count)
+
+    cli = create_cli(commands)
+    start = perf_counter()
+    for args in args_list:
+        cli.parse(args)
+    looped = (perf_counter() - start) / count
+
+    cli = create_cli(commands)
+    start = perf_counter()
+    for _ in cli.parse_many(args_list):
+        pass
+    batched = (perf_counter() - start) / count
+
+    cli = Cli.from_factory(partial(create_cli, commands))
+    start = perf_counter()
+    for _ in cli.parse_many(args_list, processes=os.cpu_count()):
+        pass
+    in_processes = (perf_counter() - start) / count
+    return looped, batched, in_processes
+
+
+def main():
+    print(f'{"commands":>10} {"parse (us/item)":>18} {"parse_many (us/item)":>22} {f"{os.cpu_count()} processes (us/item)":>26}')
+    for commands in (10, 100, 1000, 5000):
+        looped, batched, in_processes = measure(commands, 1000)
+        print(f'{commands:>10} {looped * 1e6:>18.1f} {batched * 1e6:>22.1f} {in_processes * 1e6:>26.1f}')
+
+
+if __name__ == '__main__':
+    main()
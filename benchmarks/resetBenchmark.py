@@ -0,0 +1,57 @@
+'''
+Compares Cli.reset, which drops only the state of the touched elements, against resetting every element of the tree.
+Run from the repository root: python -m benchmarks.resetBenchmark
+'''
+from __future__ import annotations
+
+from time import perf_counter
+
+from smartcli import Cli
+
+
+def create_cli(nodes: int) -> Cli:
+    cli = Cli()
+    root = cli.root
+    for i in range(nodes):
+        node = root.add_node(f'cmd{i}')
+        node.add_flag('--force', '-f')
+        node.set_possible_param_order('src')
+    return cli
+
+
+def touch(cli: Cli, count: int) -> None:
+    for i in range(count):
+        cli.root.get_node(f'cmd{i}').get_flag('-f').activate()
+
+
+def measure(nodes: int, touched: int, repeat: int) -> tuple[float, float]:
+    cli = create_cli(nodes)
+    cli.reset()
+
+    full = 0.
+    for _ in range(repeat):
+        touch(cli, touched)
+        start = perf_counter()
+        for resetable in cli.root.get_resetable():
+            resetable.reset()
+        full += perf_counter() - start
+    cli.reset()  # the full reset touches every element
+
+    dirty = 0.
+    for _ in range(repeat):
+        touch(cli, touched)
+        start = perf_counter()
+        cli.reset()
+        dirty += perf_counter() - start
+    return full / repeat, dirty / repeat
+
+
+def main():
+    print(f'{"nodes":>8} {"touched":>8} {"full tree (us)":>16} {"Cli.reset (us)":>16}')
+    for nodes in (100, 1000, 10000):
+        full, dirty = measure(nodes, 10, 3)
+        print(f'{nodes:>8} {10:>8} {full * 1e6:>16.1f} {dirty * 1e6:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
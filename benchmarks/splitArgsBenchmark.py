@@ -0,0 +1,42 @@
+'''
+Compares splitting command lines with tokenizer.split_args against shlex.split.
+Run from the repository root: python -m benchmarks.splitArgsBenchmark
+'''
+from __future__ import annotations
+
+import random
+import shlex
+from time import perf_counter
+
+from smartcli.tokenizer import split_args
+
+
+def create_lines(words: int, count: int, quoted: bool) -> list[str]:
+    rng = random.Random(0)
+    lines = []
+    for _ in range(count):
+        args = [f'word{rng.randrange(1000)}' for _ in range(words)]
+        if quoted:
+            args = [f'"{arg} x"' if i % 3 == 0 else f"'{arg}'" if i % 3 == 1 else arg + '\\ y' for i, arg in enumerate(args)]
+        lines.append('prog ' + ' '.join(args))
+    return lines
+
+
+def measure(split, lines: list[str]) -> float:
+    start = perf_counter()
+    for line in lines:
+        split(line)
+    return perf_counter() - start
+
+
+def main():
+    print(f'{"words":>7} {"quoted":>7} {"shlex (ms)":>11} {"split_args (ms)":>16} {"speedup":>8}')
+    for words in (10, 100, 1000):
+        for quoted in (False, True):
+            lines = create_lines(words, 20000 // words, quoted)
+            shlex_time, split_args_time = measure(shlex.split, lines), measure(split_args, lines)
+            print(f'{words:>7} {str(quoted):>7} {shlex_time * 1e3:>11.1f} {split_args_time * 1e3:>16.1f} {shlex_time / split_args_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,32 @@
-from .cli import Cli
-from .exceptions import ParsingException
-from .nodes.cli_elements import Root, Node, Flag, Parameter, HiddenNode, VisibleNode, CliCollection, HelpType
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cli import Cli
+    from .exceptions import ParsingException
+    from .nodes.cli_elements import Root, Node, Flag, Parameter, HiddenNode, VisibleNode, CliCollection, HelpType
+
+_modules = {
+    'Cli': '.cli',
+    'ParsingException': '.exceptions',
+    **dict.fromkeys(('Root', 'Node', 'Flag', 'Parameter', 'HiddenNode', 'VisibleNode', 'CliCollection', 'HelpType'), '.nodes.cli_elements'),
+}
+
+__all__ = list(_modules)
+
+
+def __getattr__(name: str):
+    '''
+    Loads the submodule of the name on its first use, so importing a lightweight submodule (like daemonClient) does not build the whole parser
+    '''
+    if name not in _modules:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(_modules[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-import shlex
-from typing import Iterator, Callable, Iterable, Any
+from functools import partial
+from typing import Iterator, Callable, Iterable, Any, Mapping, TYPE_CHECKING
 
-from .nodes.cli_elements import Node, Root, Parameter, HiddenNode, VisibleNode
+from .exceptions import IncorrectStateError, ParsingException
+
+from .nodes.cli_elements import Node, Root, Parameter, VisibleNode
 from .nodes.interfaces import IResetable, any_from_void, bool_from_void
+from .nodes.parseContext import ParseContext
+from .nodes.parsePlan import ParsePlan, NodePlan
+from .tokenizer import Tokenizer, TokenKind, split_args
+
+if TYPE_CHECKING:
+    from .responseFiles import ResponseFiles
 
 
 class Cli(IResetable):
@@ -14,16 +22,19 @@ class Cli(IResetable):
         if isinstance(root, str):
             root = Root(root)
         self._root: Root = root or Root()
-        self._args: list = args or []
+        self._default_args: list = args or []
         self._out = out
-        self._active_nodes = []
-        self._action_node: Node = None
-        self._is_reset_needed = False
-        self._used_arity = 0
+        self._plan: ParsePlan | None = None
+        self._plan_epoch = 0
+        self._strict = False
+        self._factory: Callable[[], Cli] | None = None
+        self._result_types: dict[int, type[ParsingResult]] = {}
         self._post_flag_parsing_actions: dict[bool_from_void, any_from_void] = {}
         self._pre_parse_actions: dict[bool_from_void, any_from_void] = {}
         self._post_parse_actions: dict[bool_from_void, any_from_void] = {}
         self._args_preprocessing_actions: dict[bool_from_void, Callable[[list[str]], Any]] = {}
+        self._response_files: ResponseFiles | None = None
+        self._bound_context: ParseContext | None = None
 
     @property
     def out(self):
@@ -45,49 +56,203 @@ class Cli(IResetable):
 
     def set_args(self, args: list[str]):
         if args:
-            self._args[:] = list(args)
+            self._default_args = list(args)
 
     def get_root(self) -> Root:
         return self._root
 
     root = property(fget=get_root)
 
-    def parse_from_str(self, input: str) -> Node:
-        return self.parse(shlex.split(input))
+    @classmethod
+    def from_factory(cls, factory: Callable[[], Cli]) -> Cli:
+        '''
+        Builds the cli with the factory and remembers it, so the cli can be rebuilt in other processes.
+        The factory has to be picklable, e.g. a function defined at the module level
+        '''
+        cli = factory()
+        cli.set_factory(factory)
+        return cli
+
+    def set_factory(self, factory: Callable[[], Cli] | None) -> None:
+        self._factory = factory
+
+    def get_factory(self) -> Callable[[], Cli] | None:
+        return self._factory
+
+    # Parse plan
+
+    def freeze(self, strict=False) -> ParsePlan:
+        '''
+        Compiles the tree into a parse plan used by all following parses. After a change of the structure of the tree (see ParseTree.bump),
+        like a node added, the plan is compiled again on its next use
+
+        :param strict: If True, raises if any combination of flags could make more than one hidden node active (see ParsePlan.get_ambiguities)
+        '''
+        epoch = self._root.get_tree().epoch
+        plan = self._root.compile()
+        if strict and (ambiguities := plan.get_ambiguities()):
+            raise ParsingException([f'{parent}: {" and ".join(names)}' for parent, table in ambiguities.items() for names in table.values()])
+        self._plan, self._plan_epoch, self._strict = plan, epoch, strict
+        return self._plan
 
-    def parse(self, args: list[str] | str = None) -> Node:
-        self.parse_without_actions(args)
-        self._action_node.perform_all_actions()
-        to_return = ParsingResult(self._action_node)  # TODO: finish parsing result
-        return to_return
+    def unfreeze(self) -> None:
+        self._plan = None
+
+    def is_frozen(self) -> bool:
+        return self._plan is not None
+
+    def _get_scope(self, node: Node) -> NodePlan | None:
+        if self._plan is None:
+            return None
+        if self._plan_epoch != self._root.get_tree().epoch:
+            self.freeze(self._strict)
+        return self._plan.get_plan(node)
+
+    def parse_from_str(self, input: str) -> ParsingResult:
+        return self.parse(split_args(input))
+
+    # Parse context
+
+    @property
+    def _context(self) -> ParseContext:
+        return self._root.get_tree().get_context()
+
+    @property
+    def _args(self) -> list[str]:
+        return self._context.args or self._default_args
+
+    @property
+    def _action_node(self) -> Node | None:
+        return self._context.action_node
+
+    @property
+    def _used_arity(self) -> int:
+        return self._context.used_arity
+
+    def _parse_in_new_context(self, parse: Callable[[], Any]) -> ParseContext:
+        '''
+        Parses in a fresh context. A top level parse leaves the context bound to the tree, so the state of the parse stays visible
+        until the next one, a nested parse (from an action) restores the context of the outer one. The contexts of other trees are not affected
+        '''
+        tree = self._root.get_tree()
+        outer = tree.get_entered()
+        context = ParseContext(tree)
+        with context:
+            context.start_parsing()
+            try:
+                parse()
+            finally:
+                context.stop_parsing()
+        self._bind_if_top_level(context, outer)
+        return context
+
+    def _create_result(self, context: ParseContext) -> ParsingResult:
+        node = context.action_node
+        result_type = self._result_types.get(id(node))
+        params = node.get_params()
+        if result_type is None or result_type.params != params:
+            result_type = self._result_types[id(node)] = ParsingResult.create_type(node, params)
+        return result_type(node, context)
+
+    def _bind_if_top_level(self, context: ParseContext, outer: ParseContext | None) -> None:
+        if outer is None:
+            context.tree.bind(context)
+            self._bound_context = context
+        else:
+            context.hide()  # the outer context is visible again
+
+    def parse(self, args: list[str] | str = None) -> ParsingResult:
+        context = self._parse_in_new_context(lambda: self._parse(args))
+        return self._create_result(context)
+
+    async def parse_async(self, args: list[str] | str = None, concurrency: int = None) -> ParsingResult:
+        '''
+        Parses like parse, but the coroutine actions are awaited concurrently (see Node.perform_all_actions_async)
+
+        :param concurrency: The maximal number of actions awaited at the same time, no limit if None
+        '''
+        tree = self._root.get_tree()
+        outer = tree.get_entered()
+        context = ParseContext(tree)
+        with context:
+            context.start_parsing()
+            try:
+                self._parse_without_actions(args)
+                await context.action_node.perform_all_actions_async(concurrency)
+            finally:
+                context.stop_parsing()
+        self._bind_if_top_level(context, outer)
+        return self._create_result(context)
+
+    def _parse(self, args: list[str] | str = None, with_actions=True) -> None:
+        self._parse_without_actions(args)
+        if with_actions:
+            self._action_node.perform_all_actions()
+
+    def parse_many(self, args_list: Iterable[list[str] | str], with_actions=True, processes: int = None, chunksize=64) -> Iterator[ParsingResult | ParsingSnapshot]:
+        '''
+        Lazily parses every arguments list, each in its own context, like parse called in a loop. If the cli is not frozen, the tree gets compiled
+        for the batch, which saves little: 3-12% per item with 10-5000 commands (see benchmarks/parseManyBenchmark.py)
+
+        :param processes: If given, the lists are parsed by a pool of processes, each rebuilding the cli with its factory (see from_factory).
+        The results are then snapshots in the order of the input
+        '''
+        if processes is not None:
+            if self._factory is None:
+                raise IncorrectStateError('Parsing in processes requires the cli to be created by a factory (Cli.from_factory)')
+            return self._parse_many_in_processes(args_list, with_actions, processes, chunksize)
+        return self._parse_many(args_list, with_actions)
+
+    def _parse_many(self, args_list: Iterable[list[str] | str], with_actions: bool) -> Iterator[ParsingResult]:
+        was_frozen = self.is_frozen()
+        if not was_frozen:
+            self.freeze()
+        try:
+            for args in args_list:
+                context = self._parse_in_new_context(lambda: self._parse(args, with_actions))
+                yield self._create_result(context)
+        finally:
+            if not was_frozen:
+                self.unfreeze()
+
+    def _parse_many_in_processes(self, args_list: Iterable[list[str] | str], with_actions: bool, processes: int, chunksize: int) -> Iterator[ParsingSnapshot]:
+        from multiprocessing import Pool  # loaded only for the parses in processes
+        with Pool(processes, initializer=_init_worker_cli, initargs=(self._factory,)) as pool:
+            yield from pool.imap(partial(_parse_in_worker, with_actions=with_actions), args_list, chunksize=chunksize)
 
     def parse_without_actions(self, args: list[str] | str = None) -> None:
-        self.reset()
+        self._parse_in_new_context(lambda: self._parse_without_actions(args))
+
+    def _parse_without_actions(self, args: list[str] | str = None) -> None:
         if isinstance(args, str):
-            args = shlex.split(args)
+            args = split_args(args)
         self.set_args(args)
-        try:
-            self._args = self._run_args_preprocessing_actions()
-            self._args = self._root.filter_flags_out(self._args)
-            self._used_arity = len(self._args) - 1
-            self._run_post_flag_parse_actions()
-
-            self._active_nodes = self._get_active_nodes()
-            self._action_node = self._active_nodes[-1]
-
-            node_args = self._get_node_args(self._args)
-            node_args = self._action_node.filter_flags_out(node_args)
-            self._used_arity = len(node_args)
-            self._run_pre_parse_actions()  # Because node arguments count can influence it, TODO: think of refactor
-            self._action_node.parse_node_args(node_args)
-            self._run_post_parse_actions()
-        finally:
-            self._is_reset_needed = True
+        context = self._context
+        context.args = list(args or self._default_args)
+        context.args = self._run_args_preprocessing_actions()
+        context.tokens = Tokenizer(context.args)
+        context.tokens.classify_flags(self._get_scope(self._root) or self._root)
+        context.set_used_arity(context.tokens.count(TokenKind.POSITIONAL))
+        self._run_post_flag_parse_actions()
+
+        context.active_nodes = self._get_active_nodes()
+        context.action_node = context.active_nodes[-1]
+
+        action_scope = self._get_scope(context.action_node)
+        context.tokens.classify_flags(action_scope or context.action_node)
+        node_args = context.tokens.get_args(TokenKind.POSITIONAL)
+        context.set_used_arity(len(node_args))
+        self._run_pre_parse_actions()  # Because node arguments count can influence it, TODO: think of refactor
+        context.action_node.parse_node_args(node_args, orders=action_scope.get_orders() if action_scope else None)
+        self._run_post_parse_actions()
 
     def _run_args_preprocessing_actions(self) -> list[str]:
+        context = self._context
+        if self._response_files:
+            context.args = self._response_files.expand(context.args)
         for action in self._get_active_actions(self._args_preprocessing_actions):
-            self._args = action(self._args)
-        return self._args
+            context.args = action(context.args)
+        return context.args
 
     def _get_active_nodes(self) -> list[Node]:
         nodes = list(self._get_active_argument_nodes())
@@ -96,22 +261,34 @@ class Cli(IResetable):
         return nodes + hidden_nodes
 
     def _get_active_argument_nodes(self) -> Iterator[VisibleNode]:
-        i, curr_node = 1, self._root
         yield self._root
-        while i < len(self._args) and curr_node.has_visible_node(self._args[i]):
-            curr_node = curr_node.get_visible_node(self._args[i])
+        curr_node, curr_plan = self._root, self._get_scope(self._root)
+        tokens = self._context.tokens
+        for i in tokens.get_indexes(TokenKind.POSITIONAL):
+            arg = tokens.args[i]
+            if curr_plan:
+                curr_plan = curr_plan.find_visible_node(arg)
+                if curr_plan is None:
+                    break
+                curr_node = curr_plan.node
+            elif curr_node.has_visible_node(arg):
+                curr_node = curr_node.get_visible_node(arg)
+            else:
+                break
+            tokens.mark(i, TokenKind.NODE)
             curr_node.activate()
             yield curr_node
-            i += 1
 
     def _get_active_hidden_nodes(self, curr_node: Node):
+        curr_plan = self._get_scope(curr_node)
+        if curr_plan:
+            while curr_plan := curr_plan.find_active_hidden_node():
+                yield curr_plan.node
+            return
         while curr_node.has_active_hidden_node():
             curr_node = curr_node.get_active_hidden_node()
             yield curr_node
 
-    def _get_node_args(self, args: list[str]) -> list[str]:
-        return args[len([node for node in self._active_nodes if not isinstance(node, HiddenNode)]):]
-
     def _get_node_arguments_count(self) -> int:
         return self._used_arity
 
@@ -145,11 +322,13 @@ class Cli(IResetable):
         return self._used_arity
 
     def reset(self) -> None:
-        if self._is_reset_needed:
-            for resetable in self._root.get_resetable():
-                resetable.reset()
-            self._is_reset_needed = False
-            self._used_arity = 0
+        '''
+        Drops the context of the last parse of this cli and the state its elements got out of any parse (see ParseTree.drop_detached). Other trees keep their state
+        '''
+        tree = self._root.get_tree()
+        tree.unbind(self._bound_context)
+        tree.drop_detached()
+        self._bound_context = None
 
     # TODO: test for it
     def add_post_flag_parsing_action_when(self, action: any_from_void, condition: bool_from_void) -> None:
@@ -196,15 +375,113 @@ class Cli(IResetable):
     def add_args_preprocessing_action(self, action: Callable[[list[str]], list[str]], condition: bool_from_void) -> None:
         self._args_preprocessing_actions[condition] = action
 
+    def enable_response_files(self, prefix: str = '@', max_size: int = 64 * 2 ** 20, max_depth: int = 8) -> None:
+        '''
+        Expands the prefix-path arguments into the arguments written in the files (see ResponseFiles) before the other preprocessing actions
+        '''
+        from .responseFiles import ResponseFiles  # loaded only for the clis reading response files
+        self._response_files = ResponseFiles(prefix, max_size=max_size, max_depth=max_depth)
+
+    def disable_response_files(self) -> None:
+        self._response_files = None
+
 
 class ParsingResult:  # TODO: implement default values/methods (like name, etc.)
+    '''
+    Result of a parse. The result of the action node and the values of its parameters are read lazily, in the context of the parse,
+    and cached. Cli creates a subclass per node (see create_type) with a get_<param> method for every parameter
+    '''
+
+    __slots__ = ('node', 'context', '_result', '_values')
+
+    params: tuple[Parameter, ...] = ()
+    _indexes: dict[str, int] = {}
+
+    def __init__(self, node: Node, context: ParseContext):
+        self.node = node
+        self.context = context
+        self._result = _unset
+        self._values = [_unset] * len(self.params)
 
-    def __init__(self, node: Node):
-        setattr(self, 'node', node)
-        setattr(self, 'result', node.get_result())
-        for param in node.get_params():
-            setattr(self, f'get_{param.name}', ParsingResult.make_getter(param))
+    @classmethod
+    def create_type(cls, node: Node, params: tuple[Parameter, ...]) -> type[ParsingResult]:
+        namespace = {'__slots__': (), 'params': params, '_indexes': {param.name: i for i, param in enumerate(params)}}
+        for i, param in enumerate(params):
+            namespace[f'get_{param.name}'] = cls._make_getter(i)
+        return type(f'{cls.__name__}_{node.name}', (cls,), namespace)
 
     @staticmethod
-    def make_getter(param: Parameter):
-        return lambda: param.get()
+    def _make_getter(i: int) -> Callable[[ParsingResult], Any]:
+        return lambda self: self._get_value(i)
+
+    @property
+    def result(self) -> Any:
+        if self._result is _unset:
+            self._result = self.context.run(self.node.get_result)
+        return self._result
+
+    def get(self, name: str) -> Any:
+        return self._get_value(self._indexes[name])
+
+    def _get_value(self, i: int) -> Any:
+        value = self._values[i]
+        if value is _unset:
+            value = self._values[i] = self.context.run(self.params[i].get)
+        return value
+
+    def as_dict(self) -> ParsingResultView:
+        return ParsingResultView(self)
+
+    def to_snapshot(self) -> ParsingSnapshot:
+        return ParsingSnapshot(self.node.name, self.result, dict(self.as_dict()))
+
+
+class ParsingResultView(Mapping):
+    '''
+    Read only mapping of the parameter names to the values of a parsing result, without copying them
+    '''
+
+    __slots__ = ('_parsing_result',)
+
+    def __init__(self, parsing_result: ParsingResult):
+        self._parsing_result = parsing_result
+
+    def __getitem__(self, name: str) -> Any:
+        return self._parsing_result.get(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parsing_result._indexes)
+
+    def __len__(self) -> int:
+        return len(self._parsing_result.params)
+
+
+class ParsingSnapshot:
+    '''
+    Picklable copy of a parsing result, without the tree it comes from
+    '''
+
+    def __init__(self, node_name: str, result: Any, values: dict[str, Any]):
+        self.node_name = node_name
+        self.result = result
+        self.values = values
+
+    def __getattr__(self, name: str):
+        if name.startswith('get_') and name[4:] in self.__dict__.get('values', {}):
+            return partial(self.values.get, name[4:])
+        raise AttributeError(name)
+
+
+_unset = object()
+_worker_cli: Cli | None = None
+
+
+def _init_worker_cli(factory: Callable[[], Cli]) -> None:
+    global _worker_cli
+    _worker_cli = factory()
+    _worker_cli.freeze()
+
+
+def _parse_in_worker(args: list[str] | str, with_actions=True) -> ParsingSnapshot:
+    context = _worker_cli._parse_in_new_context(lambda: _worker_cli._parse(args, with_actions))
+    return _worker_cli._create_result(context).to_snapshot()
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, asynccontextmanager, contextmanager, redirect_stdout
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Iterator
+
+from .cli import Cli
+from .exceptions import ParsingException, IncorrectArity
+
+
+class CliDaemon:
+    '''
+    Serves the parses of a cli built once over a local Unix socket, the clients are thin (see daemonClient).
+    Every request is parsed with the actions in its own parse context, with the working directory, the environment and the stdout of the client.
+    The parses run in a pool of threads, so they do not block the connections. The parses of the requests with the same working directory
+    and environment run at the same time, only a request with other ones waits for the running parses (see _SharedProcessState).
+    The working directory and the environment are switched for the whole process, so while parses run, the other (non-daemon) threads see the ones of the client
+    '''
+
+    def __init__(self, cli: Cli, path: str, request_limit: int = 16 * 2 ** 20, workers: int = None):
+        self._cli = cli
+        self._path = path
+        self._request_limit = request_limit
+        self._workers = workers
+        self._server: asyncio.AbstractServer | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._process_state: _SharedProcessState | None = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    async def start(self) -> asyncio.AbstractServer:
+        self._executor = ThreadPoolExecutor(self._workers, thread_name_prefix='cli-daemon')
+        self._process_state = _SharedProcessState()  # bound to the loop of the server
+        umask = os.umask(0o177)  # the socket is created accessible only to the user, so no one else can connect before it is secured
+        try:
+            self._server = await asyncio.start_unix_server(self._handle_connection, self._path, limit=self._request_limit)
+        finally:
+            os.umask(umask)
+        return self._server
+
+    async def serve_forever(self) -> None:
+        server = self._server or await self.start()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._remove_socket()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._remove_socket()
+
+    def run(self) -> None:
+        asyncio.run(self.serve_forever())
+
+    def _remove_socket(self) -> None:
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                await self._handle_request(json.loads(line), writer)
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request: dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        code, error = 0, None
+        try:
+            async with self._process_state.enter(request.get('cwd'), request.get('env')):
+                await loop.run_in_executor(self._executor, self._parse, request['argv'], _ForwardedOutput(writer, loop))
+        except (ParsingException, IncorrectArity) as e:
+            code, error = 2, f'{type(e).__name__}: {e}'
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception as e:
+            code, error = 1, f'{type(e).__name__}: {e}'
+        _send(writer, {'exit': code, 'error': error})
+
+    def _parse(self, argv: list[str], out: _ForwardedOutput) -> None:
+        token = _output.set(out)
+        try:
+            self._cli.parse(argv)
+        finally:
+            _output.reset(token)
+
+
+class _SharedProcessState:
+    '''
+    The working directory, the environment and the stdout of the running parses, which are shared by the whole process.
+    The first parse switches them to the ones of its request and the last one restores them. A request with other ones waits until no parse runs
+    '''
+
+    def __init__(self):
+        self._condition = asyncio.Condition()
+        self._running = 0
+        self._key: tuple | None = None
+        self._switched: ExitStack | None = None
+
+    @asynccontextmanager
+    async def enter(self, cwd: str | None, env: dict[str, str] | None) -> AsyncIterator[None]:
+        key = cwd, None if env is None else sorted(env.items())
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._running == 0 or self._key == key)
+            if self._running == 0:
+                self._switch(cwd, env)
+                self._key = key
+            self._running += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._running -= 1
+                if self._running == 0:
+                    self._switched.close()
+                    self._switched = self._key = None
+                    self._condition.notify_all()
+
+    def _switch(self, cwd: str | None, env: dict[str, str] | None) -> None:
+        with ExitStack() as stack:
+            stack.enter_context(_in_directory(cwd))
+            stack.enter_context(_with_environment(env))
+            stack.enter_context(redirect_stdout(_RoutedOutput(sys.stdout)))
+            self._switched = stack.pop_all()
+
+
+_output: ContextVar[_ForwardedOutput | None] = ContextVar('daemon_output', default=None)
+
+
+class _RoutedOutput(io.TextIOBase):
+    '''
+    Stdout of the running parses, writing to the output of the request parsed in the current thread (see CliDaemon._parse)
+    '''
+
+    def __init__(self, default):
+        self._default = default
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        out = _output.get()
+        return out.write(text) if out is not None else self._default.write(text)
+
+    def flush(self) -> None:
+        if _output.get() is None:
+            self._default.flush()
+
+
+class _ForwardedOutput(io.TextIOBase):
+    '''
+    Output of a request, written from the thread of the parse. The messages are sent by the event loop in the order they were written
+    '''
+
+    def __init__(self, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop):
+        self._writer = writer
+        self._loop = loop
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            self._loop.call_soon_threadsafe(_send, self._writer, {'out': text})
+        return len(text)
+
+
+def _send(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    writer.write(json.dumps(message).encode() + b'\n')
+
+
+@contextmanager
+def _in_directory(path: str | None) -> Iterator[None]:
+    if path is None:
+        yield
+        return
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@contextmanager
+def _with_environment(env: dict[str, str] | None) -> Iterator[None]:
+    if env is None:
+        yield
+        return
+    previous = dict(os.environ)
+    try:
+        _replace_environment(env)
+        yield
+    finally:
+        _replace_environment(previous)
+
+
+def _replace_environment(env: dict[str, str]) -> None:
+    '''
+    Makes the environment equal to the given one, changing only the variables that differ
+    '''
+    for name in os.environ.keys() - env.keys():
+        del os.environ[name]
+    os.environ.update(env)
+
+
+def serve(cli: Cli, path: str) -> None:
+    '''
+    Serves the parses of the cli on the Unix socket until the process is stopped
+    '''
+    CliDaemon(cli, path).run()
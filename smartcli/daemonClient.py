@@ -0,0 +1,48 @@
+'''
+Thin client of the parse daemon (see daemon.CliDaemon). It forwards the arguments, the working directory and the environment
+to the daemon and writes back what the daemon's cli printed, so the cli is not built again on every invocation.
+Run: python -m smartcli.daemonClient SOCKET_PATH PROG [ARGS...]
+'''
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+
+
+def run_client(path: str, argv: list[str], out=None, err=None, cwd: str = None, env: dict[str, str] = None) -> int:
+    '''
+    :param cwd: The working directory of the parse, the one of the client if None
+    :param env: The environment of the parse, the one of the client if None
+    :return: The exit code of the parse: 0 on success, 1 if an action raised, 2 if the arguments could not be parsed
+    '''
+    out = out or sys.stdout
+    err = err or sys.stderr
+    request = {'argv': list(argv), 'cwd': cwd if cwd is not None else os.getcwd(), 'env': env if env is not None else dict(os.environ)}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        connection.sendall(json.dumps(request).encode() + b'\n')
+        connection.shutdown(socket.SHUT_WR)
+        with connection.makefile('r', encoding='utf-8') as responses:
+            for line in responses:
+                response = json.loads(line)
+                if 'out' in response:
+                    out.write(response['out'])
+                elif 'exit' in response:
+                    if response.get('error'):
+                        err.write(response['error'] + '\n')
+                    return response['exit']
+    err.write('The daemon closed the connection\n')
+    return 1
+
+
+def main() -> None:
+    if len(sys.argv) < 3:
+        sys.stderr.write(__doc__)
+        sys.exit(2)
+    sys.exit(run_client(sys.argv[1], sys.argv[2:]))
+
+
+if __name__ == '__main__':
+    main()
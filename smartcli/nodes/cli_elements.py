@@ -1,20 +1,25 @@
 from __future__ import annotations
 
 import operator as op
-import shlex
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
 from enum import Enum
 from functools import reduce
-from inspect import signature
-from itertools import accumulate, islice, zip_longest, chain, takewhile
-from typing import Iterable, Iterator, Callable, Any, TypeVar, Type, Sized
-
-from more_itertools import split_when, unique_everseen
+from itertools import islice, zip_longest, chain, takewhile
+from types import MappingProxyType
+from typing import Iterable, Iterator, Callable, Any, TypeVar, Type, Sized, Mapping, Sequence, Hashable, TYPE_CHECKING
 
 from smartcli.exceptions import ParsingException, ValueAlreadyExistsError, IncorrectStateError, IncorrectArity
+from smartcli.nodes.conditions import AtomCondition, Condition, Combined, FlagActive, FlagsActive, FlagsInCollection, Not, NotEmpty, get_inputs_of, get_atoms_of_all
+from smartcli.nodes.converters import convert_all, get_typecode
 from smartcli.nodes.interfaces import INamable, IResetable, bool_from_iterable, bool_from_void, any_from_void, any_from_str, IDefaultStorable
-from smartcli.nodes.smartList import SmartList
+from smartcli.nodes.parseContext import ParseContext, ParseStateMixin, ParseTree
+from smartcli.nodes.parsePlan import ParsePlan, NodePlan
+from smartcli.nodes.smartList import SmartArray, SmartDeque, SmartList, ValuesView
+from smartcli.tokenizer import split_args
+
+if TYPE_CHECKING:
+    import asyncio
+    from smartcli.nodes.helpManager import HelpManager
 
 
 #####################################################################################################
@@ -23,246 +28,6 @@ from smartcli.nodes.smartList import SmartList
 # H E L P # H E L P # H E L P # H E L P # H E L P # H E L P # H E L P # H E L P # H E L P # H E L P #
 #####################################################################################################
 
-#################
-# Help Building #
-#################
-
-
-class HelpRoot:
-
-    def __init__(self, root: IHelp, **kwargs):
-        super().__init__(**kwargs)
-        self._root: IHelp = root
-
-
-class HelpManager(HelpRoot):
-
-    def __init__(self, root: IHelp, out=print, **kwargs):
-        super().__init__(root=root, **kwargs)
-        self._formatter = HelpFormatter()
-        sections = [HeaderBuilder,
-                    SynopsisBuilder,
-                    DescriptionBuilder,
-                    ParametersSectionBuilder,
-                    FlagsSectionBuilder,
-                    VisibleNodesSectionBuilder,
-                    HiddenNodesSectionBuilder,
-        ]
-        self._out = out
-        self._sections = list(map(lambda s: s(self._root), sections))
-
-    @property
-    def out(self):
-        return self._out
-
-    def set_out_stream(self, out):
-        self._out = out
-
-    def print_help(self, out=None) -> None:
-        out = out or self._out
-        out(self.create_help_string())
-
-    def create_help_string(self) -> str:
-        content = self._build_help_content()
-        help_string = self._formatter.format(content)
-        return help_string
-
-    def _build_help_content(self) -> list:
-        is_content_empty = lambda section: section[1] and section[1][0]
-        built = map(SectionBuilder.build, self._sections)
-        not_empty = filter(is_content_empty, built)
-        joined = reduce(op.add, not_empty)
-        return joined
-
-
-class HelpFormatter:
-
-    def __init__(self):
-        self._space = ' '
-        self._big_space_width = 5
-        self._small_space_width = 3
-        self._max_width = 120
-        self._section_separator = '\n'
-        self._option_separator = '\n'
-
-    def format(self, to_format: list | str, depth=0) -> str:
-        if isinstance(to_format, list):
-            return self._format_list(to_format, depth+1)
-        elif isinstance(to_format, str):
-            return self._format_long_text(to_format, depth)
-
-        raise ValueError
-
-    def _format_list(self, to_format: list, depth: int) -> str:
-        sep = self._get_section_separator(depth)
-        prelist = [i-1 for i, elem in enumerate(to_format) if isinstance(elem, list) and elem[0]]
-        add_colon_if_is_header = lambda i, part: part + ':' if i in prelist and isinstance(part, str) else part
-        not_empty_formatted = (self.format(add_colon_if_is_header(i, part), depth) for i, part in enumerate(to_format) if part and part[0])
-        merged = self._lines_to_str(list(not_empty_formatted), sep)
-        return merged
-
-    def _format_long_text(self, to_format: str, depth: int) -> str:
-        paragraphs = to_format.split('\n')
-        formatted = map(lambda p: self._format_paragraph(p, depth), paragraphs)
-        return '\n'.join(list(formatted))
-
-    def _format_paragraph(self, paragraph: str, depth: int) -> str:
-        if not paragraph:
-            return ''
-        space_length = self._get_space_length(depth)
-        line_max = self._max_width - space_length
-        mod_max = lambda a: a // line_max
-        is_line_bound = lambda p1, p2: mod_max(p1[0]) != mod_max(p2[0])
-        indent = ' ' * space_length
-
-        words = paragraph.split(' ')
-        lens_words = map(lambda w: (len(w) + 1, w), words)  # +1 for space
-        with_position = accumulate(lens_words, lambda acc, elem: (acc[0] + elem[0], elem[1]))
-        lens_lines = split_when(with_position, is_line_bound)
-        lines = map(lambda line: ' '.join(list(map(lambda pair: pair[1], line))), lens_lines)
-        indented_lines = map(lambda line: indent + line, lines)
-        return '\n'.join(list(indented_lines))
-
-    def _lines_to_str(self, lines: list, sep='\n'):
-        length = len(lines)
-        if length > 1:
-            return sep.join(lines)
-        if length > 0:
-            return lines[0]
-        return ''
-
-    def _get_space_length(self, depth: int):
-        big, small = self._big_space_width, self._small_space_width
-        if depth <= 1:
-            return 0
-        return big + (small * (depth-2))
-
-    def _get_section_separator(self, depth: int):
-        if depth == 2:
-            return self._section_separator
-        return self._option_separator
-
-
-class SectionBuilder(HelpRoot, ABC):
-
-    def __init__(self, root, **kwargs):
-        super().__init__(root=root, **kwargs)
-
-    def build(self) -> list:
-        section = self._build_section()
-        if isinstance(section, str):
-            section = [section]
-        return [self.get_section_name().upper(), list(section)]
-
-    def _get_sub_helps(self, kind: HelpType = None) -> dict[HelpType, list[IHelp]] | list[IHelp]:
-        sub_helps = self._root.get_sub_helps()
-        if kind is None:
-            return sub_helps
-        return sub_helps[kind] if kind in sub_helps else []
-
-    def _get_visible_nodes(self) -> list[VisibleNode]:
-        return self._get_sub_helps(HelpType.NODE)
-
-    def _get_hidden_nodes(self) -> list[HiddenNode]:
-        return self._get_sub_helps(HelpType.HIDDEN_NODES)
-
-    def _get_flags(self) -> list[Flag]:
-        return self._get_sub_helps(HelpType.FLAG)
-
-    def _get_parameters(self) -> list[Parameter]:
-        return self._get_sub_helps(HelpType.PARAMETER)
-
-    @abstractmethod
-    def get_section_name(self) -> str:
-        raise NotImplementedError
-
-    @abstractmethod
-    def _build_section(self):
-        raise NotImplementedError
-
-
-class HeaderBuilder(SectionBuilder):
-
-    def get_section_name(self) -> str:
-        return 'Name'
-
-    def _build_section(self) -> list:
-        return [f'{self._root.get_help_naming_string()} - {self.get_header_description_string()}']
-
-    def get_header_description_string(self) -> str:
-        return self._root.get_short_description()
-
-
-class SynopsisBuilder(SectionBuilder):
-
-    def get_section_name(self) -> str:
-        return 'Synopsis'
-
-    def _build_section(self):
-        return [self._root.get_synopsis() or self._build_synopsis()]  # TODO: implement
-
-    def _build_synopsis(self) -> str:
-        return ''
-
-    def _bracket(self, to_bracket: i_help_type) -> str:
-        if isinstance(to_bracket, FinalNode):
-            return f'<{to_bracket.get_help_naming_string()}>' if to_bracket.has_lower_limit() else f'[{to_bracket.get_help_naming_string()}]'
-
-
-class DescriptionBuilder(SectionBuilder):
-
-    def get_section_name(self) -> str:
-        return 'Description'
-
-    def _build_section(self):
-        return self._root.get_long_description()
-
-
-class SubHelpBuilder(SectionBuilder, ABC):
-
-    def get_sub_helps(self) -> list[IHelp]:
-        sub_helps = self._root.get_sub_helps()
-        name = self.get_section_name()
-        kind = HelpType(name)
-        try:
-            return sub_helps[kind]
-        except KeyError:
-            return []
-
-    def _build_section(self):
-        return reduce(op.add, map(self.build_single_sub_help, self.get_sub_helps()), [])
-
-    def build_single_sub_help(self, sub_help: IHelp) -> list:
-        return [sub_help.get_help_naming_string(), self.build_single_sub_help_description(sub_help)]
-
-    def build_single_sub_help_description(self, sub_help: IHelp) -> list[str] | str:
-        return [sub_help.get_short_description()]
-
-
-class ParametersSectionBuilder(SubHelpBuilder):
-    def get_section_name(self) -> str:
-        return HelpType.PARAMETER.value
-
-
-class VisibleNodesSectionBuilder(SubHelpBuilder):
-    def get_section_name(self) -> str:
-        return HelpType.NODE.value
-
-
-class HiddenNodesSectionBuilder(SubHelpBuilder):
-    def get_section_name(self) -> str:
-        return HelpType.HIDDEN_NODES.value
-
-    def build_single_sub_help(self, sub_help: IHelp) -> list:
-        built = super().build_single_sub_help(sub_help)
-        built += [[sub_help.get_synopsis()]]
-        return built
-
-
-class FlagsSectionBuilder(SubHelpBuilder):
-    def get_section_name(self) -> str:
-        return HelpType.FLAG.value
-
 
 class HelpType(Enum):
     NODE = 'Nodes'
@@ -280,14 +45,33 @@ class IHelp(ABC):
     Interface for objects that have help and can be managed by HelpManager
     '''
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self._long_description: list[str, ...] = []
+    _help: Help | None = None
+    _long_description: list[str] | tuple = ()
 
     @abstractmethod
     def get_help(self) -> Help:
         raise NotImplementedError
 
+    def _init_help(self, short_description: str, long_description: str) -> None:
+        '''
+        The help without descriptions is allocated on the first get_help, until then the shared empty help is read
+        '''
+        if short_description != '' or long_description != '':
+            self._help = Help(short_description, long_description)
+
+    def _get_own_help(self) -> Help:
+        if self._help is None:
+            self._help = Help('', '')
+        return self._help
+
+    def _read_help(self) -> Help:
+        return self._help or EMPTY_HELP
+
+    def _add_long_description(self, description: str) -> None:
+        if not self._long_description:
+            self._long_description = []
+        self._long_description.append(description)
+
     @property
     def help(self):
         return self.get_help()
@@ -306,21 +90,37 @@ class IHelp(ABC):
         return naming
 
     def get_short_description(self) -> str:
-        return self.help.short_description if self.help.short_description is not None else ''
+        help = self._read_help()
+        return help.short_description if help.short_description is not None else ''
 
     def get_long_description(self) -> str:
-        return self.help.long_description if self.help.long_description is not None else ''
+        help = self._read_help()
+        return help.long_description if help.long_description is not None else ''
 
     def get_synopsis(self) -> str:
-        return self.help.synopsis if self.help.synopsis is not None else ''
+        help = self._read_help()
+        return help.synopsis if help.synopsis is not None else ''
 
 
-@dataclass
 class Help:
-    short_description: str = None
-    long_description: str = None
-    synopsis: str = None
 
+    def __init__(self, short_description: str = None, long_description: str = None, synopsis: str = None):
+        self.short_description = short_description
+        self.long_description = long_description
+        self.synopsis = synopsis
+
+    def __eq__(self, other):
+        if not isinstance(other, Help):
+            return NotImplemented
+        return (self.short_description, self.long_description, self.synopsis) == (other.short_description, other.long_description, other.synopsis)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'Help(short_description={self.short_description!r}, long_description={self.long_description!r}, synopsis={self.synopsis!r})'
+
+
+EMPTY_HELP = Help('', '')
 
 ###################
 # Default storage #
@@ -358,6 +158,7 @@ class DefaultStorage(IDefaultStorable):
         if not isinstance(get_default, Callable):
             raise ValueError
         self._get_defaults[condition] = get_default
+        self._bump_epoch()
 
     def is_default_set(self) -> bool:
         return len(self._get_defaults) > 0
@@ -384,17 +185,17 @@ class IActivable(INamable, ABC):
         return IActivable.merge_conditions(to_map, func=func)
 
     @staticmethod
-    def merge_conditions(conditions: tuple[bool_from_void, ...], func: bool_from_iterable) -> bool_from_void:
-        return lambda: func((IActivable._is_met(condition, func) for condition in conditions))
+    def merge_conditions(conditions: tuple[compositeActive, ...], func: bool_from_iterable) -> Combined:
+        return Combined(func, *(IActivable._to_condition(condition, func) for condition in conditions))
 
     @staticmethod
-    def _is_met(to_check: compositeActive, func: bool_from_iterable) -> bool:
-        if isinstance(to_check, IActivable):
-            return to_check.is_active()
-        elif isinstance(to_check, Callable):
-            return to_check()
-        elif isinstance(to_check, Iterable):
-            return IActivable.merge_conditions(tuple(to_check), func)()
+    def _to_condition(to_convert: compositeActive, func: bool_from_iterable) -> bool_from_void:
+        if isinstance(to_convert, IActivable):
+            return FlagActive(to_convert)
+        elif isinstance(to_convert, Callable):
+            return to_convert
+        elif isinstance(to_convert, Iterable):
+            return IActivable.merge_conditions(tuple(to_convert), func)
         else:
             raise ValueError
 
@@ -409,11 +210,20 @@ active = bool_from_void | IActivable
 compositeActive = active | Iterable[active]
 
 
-class ImplicitlyActivableMixin(IActivable):
+class ImplicitlyActivableMixin(IActivable, ParseStateMixin):
 
     def __init__(self, activated=False, **kwargs):
         super().__init__(**kwargs)
-        self._activated = activated
+        self._initially_activated = activated
+
+    def _create_parse_state(self) -> dict[str, Any]:
+        state = super()._create_parse_state()
+        state['activated'] = self._initially_activated
+        return state
+
+    @property
+    def _activated(self) -> bool:
+        return self._get_parse_state()['activated']
 
     def activate(self):
         self.set_activated(True)
@@ -422,21 +232,69 @@ class ImplicitlyActivableMixin(IActivable):
         self.set_activated(False)
 
     def set_activated(self, val: bool):
-        self._activated = val
+        self._get_parse_state()['activated'] = val
+        self._mark_changed()
 
     def is_active(self) -> bool:
         return self._activated
 
 
 class ConditionallyActiveMixin(IActivable, IHelp, ABC):
+    _condition_inputs: tuple | None = None
+    _condition_inputs_epoch = -1
+    _condition_atoms: tuple[AtomCondition, ...] | None = None
+    _condition_atoms_epoch = -1
+    _active_conditions: SmartList | tuple = ()
+    _inactive_conditions: SmartList | tuple = ()
 
     def __init__(self, active_condition: compositeActive = None, inactive_condition: compositeActive = None, default_state: bool = False, **kwargs):
         super().__init__(**kwargs)
-        self._active_conditions = SmartList(self._map_to_single(active_condition)) if active_condition else SmartList()
-        self._inactive_conditions = SmartList(self._map_to_single(inactive_condition)) if inactive_condition else SmartList()
+        if active_condition:
+            self._active_conditions = SmartList(self._map_to_single(active_condition))
+        if inactive_condition:
+            self._inactive_conditions = SmartList(self._map_to_single(inactive_condition))
         self._default: bool = default_state
 
     def is_active(self) -> bool:
+        return self.get_tree().evaluate_once(self, self._evaluate_conditions, self.get_condition_inputs())
+
+    def get_condition_inputs(self) -> tuple | None:
+        '''
+        :return: The elements the conditions read (see conditions.Condition) or None if any of the conditions is a plain callable
+        '''
+        epoch = self._get_epoch()
+        if self._condition_inputs_epoch != epoch:
+            self._condition_inputs, self._condition_inputs_epoch = self._collect_condition_inputs(), epoch
+        return self._condition_inputs
+
+    def _collect_condition_inputs(self) -> tuple | None:
+        inputs = [self]
+        for condition in chain(self._active_conditions, self._inactive_conditions):
+            condition_inputs = get_inputs_of(condition)
+            if condition_inputs is None:
+                return None
+            inputs.extend(condition_inputs)
+        return tuple({id(elem): elem for elem in inputs}.values())
+
+    def get_condition_atoms(self) -> tuple[AtomCondition, ...] | None:
+        '''
+        :return: The elementary conditions of the conditions (see conditions.Condition.get_atoms) or None if they cannot be broken down
+        '''
+        epoch = self._get_epoch()
+        if self._condition_atoms_epoch != epoch:
+            self._condition_atoms = get_atoms_of_all(chain(self._active_conditions, self._inactive_conditions))
+            self._condition_atoms_epoch = epoch
+        return self._condition_atoms
+
+    def is_active_with(self, values: Mapping[Hashable, bool]) -> bool:
+        '''
+        Evaluates the conditions for the given values of their atoms (see get_condition_atoms)
+        '''
+        if not self._active_conditions and not self._inactive_conditions:
+            return self._get_default_state()
+        return all(func.evaluate_with(values) for func in self._active_conditions) and not any(func.evaluate_with(values) for func in self._inactive_conditions)
+
+    def _evaluate_conditions(self) -> bool:
         if not self._active_conditions and not self._inactive_conditions:
             return self._get_default_state()
         return all(func() for func in self._active_conditions) and not any(func() for func in self._inactive_conditions)
@@ -460,11 +318,17 @@ class ConditionallyActiveMixin(IActivable, IHelp, ABC):
 
     def set_active_on_conditions(self, *conditions: compositeActive, func: bool_from_iterable = all):
         if conditions and conditions[0]:
-            self._active_conditions += IActivable._map_to_single(*conditions, func=func)
+            self._active_conditions = SmartList(*self._active_conditions, IActivable._map_to_single(*conditions, func=func))
+            self._conditions_changed()
 
     def set_inactive_on_conditions(self, *conditions: compositeActive, func: bool_from_iterable = all):
         if conditions and conditions[0]:
-            self._inactive_conditions += IActivable._map_to_single(*conditions, func=func)
+            self._inactive_conditions = SmartList(*self._inactive_conditions, IActivable._map_to_single(*conditions, func=func))
+            self._conditions_changed()
+
+    def _conditions_changed(self) -> None:
+        self._bump_epoch()
+        self._mark_changed()
 
     def set_active(self, first_when: active, *when: compositeActive, but_not: compositeActive = None):
         self.set_active_and(first_when, *when)
@@ -472,40 +336,47 @@ class ConditionallyActiveMixin(IActivable, IHelp, ABC):
             self.set_inactive_or(*but_not if isinstance(but_not, Iterable) else but_not)
 
     def set_active_on_flags(self, *flags: Flag, func=any):
-        self.set_active_on_conditions(lambda: func([flag.is_active() for flag in flags]))
+        self.set_active_on_conditions(self._flags_condition(flags, func))
 
     def set_inactive_on_flags(self, *flags: Flag, func=any):
-        self.set_inactive_on_conditions(lambda: func([flag.is_active() for flag in flags]))
+        self.set_inactive_on_conditions(self._flags_condition(flags, func))
+
+    @staticmethod
+    def _flags_condition(flags: tuple[Flag, ...], func: bool_from_iterable) -> Condition:
+        if func in (any, all) and all(isinstance(flag, Flag) for flag in flags):
+            return FlagsActive(*flags, func=func)
+        return Combined(func, *map(FlagActive, flags))
 
     def set_active_on_flags_in_collection(self, collection: CliCollection, *flags: Flag, but_not: list[Flag] | Flag = None, func=all, but_not_func=any):
         but_not = but_not or []
         but_not = [but_not] if isinstance(but_not, Flag) else but_not
-        self.set_active_on_conditions(lambda: func((flag in collection for flag in flags)))
+        self.set_active_on_conditions(FlagsInCollection(collection, *flags, func=func))
         self.set_inactive_on_flags_in_collection(collection, *but_not, func=but_not_func)
 
     def set_inactive_on_flags_in_collection(self, collection: CliCollection, *flags: Flag, func=all):
-        self.set_inactive_on_conditions(lambda: func((flag in collection for flag in flags)))
+        self.set_inactive_on_conditions(FlagsInCollection(collection, *flags, func=func))
 
     def set_active_on_not_empty(self, collection: CliCollection):
-        self.set_active_on_conditions(lambda: len(collection) > 0)
+        self.set_active_on_conditions(NotEmpty(collection))
 
     def set_inactive_on_not_empty(self, collection: CliCollection):
-        self.set_inactive_on_conditions(lambda: len(collection) > 0)
+        self.set_inactive_on_conditions(NotEmpty(collection))
 
     def set_active_on_empty(self, collection: CliCollection):
-        self.set_active_on_conditions(lambda: not len(collection))
+        self.set_active_on_conditions(Not(NotEmpty(collection)))
 
     def set_inactive_on_empty(self, collection: CliCollection):
-        self.set_inactive_on_conditions(lambda: not len(collection))
+        self.set_inactive_on_conditions(Not(NotEmpty(collection)))
 
 
 class ActionOnActivationMixin(INamable, IHelp, ABC):
+    '''
+    The containers of the actions are allocated with the first action, until then the shared empty ones are read
+    '''
     T = TypeVar('T')
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self._on_activation: SmartList[Callable] = SmartList()
-        self._additional_actions: dict[bool_from_void, any_from_void] = {}
+    _on_activation: SmartList[Callable] | tuple = ()
+    _additional_actions: dict[bool_from_void, any_from_void] = MappingProxyType({})
 
     def when_active_turn_off(self, *to_turn_off: IActivable) -> None:
         self.when_active_set_activated(False, *to_turn_off)
@@ -516,12 +387,14 @@ class ActionOnActivationMixin(INamable, IHelp, ABC):
     def when_active_set_activated(self, activated: bool, *to_set: IActivable):
         activate_once = lambda a: a.set_activated(activated)
         self.when_active_apply_for_all(activate_once, to_set)
-        self._long_description.append(f'When {self.name} is activated, it turns {"on" if activated else "off"} {", ".join(map(INamable.get_name, to_set))}')
+        self._add_long_description(f'When {self.name} is activated, it turns {"on" if activated else "off"} {", ".join(map(INamable.get_name, to_set))}')
 
     def when_active_apply_for_all(self, func: Callable[[T], Any], elems: Iterable[T]):
         self.when_active(lambda: (func(elem) for elem in elems))
 
     def when_active(self, action: Callable) -> None:
+        if not self._on_activation:
+            self._on_activation = SmartList()
         self._on_activation += action
 
     def when_active_add_name_to(self, collection: CliCollection) -> None:
@@ -541,6 +414,11 @@ class ActionOnActivationMixin(INamable, IHelp, ABC):
         self.when_active(lambda: collection.append(self))  # TODO has name and IActive?
 
     def when_active_and(self, action: any_from_void, condition: bool_from_void):
+        self._add_additional_action(action, condition)
+
+    def _add_additional_action(self, action: any_from_void, condition: bool_from_void) -> None:
+        if not self._additional_actions:
+            self._additional_actions = {}
         self._additional_actions[condition] = action
 
     def _perform_on_activation(self):
@@ -579,7 +457,38 @@ class ActionOnCondition(ConditionallyActiveMixin, ActionOnActivationMixin, ABC):
         return result
 
     def when_active_and(self, action: any_from_void, condition: bool_from_void):
-        self._additional_actions[condition] = action
+        self._add_additional_action(action, condition)
+
+
+class NodeAction:
+    '''
+    Action of a node with the way of passing the parameter values to it, computed once on the first call.
+    The positional parameters of the action get the values of the first parameters of the node,
+    the keyword only parameters get the values of the node parameters of the same names
+    '''
+
+    __slots__ = ('action', 'arity', 'keywords')
+
+    def __init__(self, action: Callable):
+        self.action = action
+        self.arity: int | None = None
+        self.keywords: tuple[str, ...] = ()
+
+    def _read_signature(self) -> None:
+        from inspect import signature, Parameter as SignatureParameter  # inspect is loaded only once actions run
+        positional_kinds = (SignatureParameter.POSITIONAL_ONLY, SignatureParameter.POSITIONAL_OR_KEYWORD, SignatureParameter.VAR_POSITIONAL)
+        parameters = signature(self.action).parameters.values()
+        self.keywords = tuple(parameter.name for parameter in parameters if parameter.kind == SignatureParameter.KEYWORD_ONLY)
+        self.arity = sum(1 for parameter in parameters if parameter.kind in positional_kinds)
+
+    def __call__(self, params: Mapping[str, Parameter]) -> Any:
+        if self.arity is None:
+            self._read_signature()
+        args = [param.get() for param in islice(params.values(), self.arity)]
+        if not self.keywords:
+            return self.action(*args)
+        kwargs = {name: params[name].get() for name in self.keywords if name in params}
+        return self.action(*args, **kwargs)
 
 
 ###########################
@@ -587,30 +496,105 @@ class ActionOnCondition(ConditionallyActiveMixin, ActionOnActivationMixin, ABC):
 ###########################
 
 
+class NameIndex(dict):
+    '''
+    Maps every name and alternative name of the registered elements to the element itself
+    '''
+
+    __slots__ = ('_value_type',)
+
+    def __init__(self, value_type: Type, **kwargs):
+        super().__init__(**kwargs)
+        self._value_type = value_type
+
+    def check(self, namable: INamable, names: Iterable[str]) -> None:
+        for name in names:
+            if self.get(name, namable) is not namable:
+                raise ValueAlreadyExistsError(self._value_type, name)
+
+    def register(self, namable: AlternativeNamesMixin) -> None:
+        names = namable.get_all_names()
+        self.check(namable, names)
+        self.update(dict.fromkeys(names, namable))
+        namable.add_name_index(self)
+
+    def register_names(self, namable: INamable, names: Iterable[str]) -> None:
+        self.update(dict.fromkeys(names, namable))
+
+
+class CollectionIndex:
+    '''
+    Index of the values of a collection: the values themselves and the names of the string values and of the flags, so checking the membership takes constant time.
+    It is built for an epoch of the tree of the collection (see ParseTree.bump), as the names of the flags can change
+    '''
+
+    __slots__ = ('tree', 'epoch', 'flag_bits', '_values', '_unhashable', '_names')
+
+    def __init__(self, tree: ParseTree, values: Iterable = ()):
+        self.tree = tree
+        self.epoch = tree.epoch
+        self.flag_bits: int | None = 0
+        self._values = set()
+        self._unhashable = []
+        self._names = set()
+        self.add_all(values)
+
+    def add_all(self, values: Iterable) -> None:
+        for value in values:
+            self.add(value)
+
+    def add(self, value) -> None:
+        if isinstance(value, Flag):
+            self._names.update(value.get_all_names())
+            if value.get_tree() is not self.tree:  # the bits of the flags of other trees mean other flags
+                self.flag_bits = None
+            elif self.flag_bits is not None:
+                self.flag_bits |= value.get_mask()
+        else:
+            self.flag_bits = None
+            if isinstance(value, str):
+                self._names.add(value)
+        try:
+            self._values.add(value)
+        except TypeError:
+            self._unhashable.append(value)
+
+    def has(self, item) -> bool:
+        try:
+            if item in self._values:
+                return True
+        except TypeError:
+            return item in self._unhashable or any(item == value for value in self._values)
+        return bool(self._unhashable) and item in self._unhashable
+
+    def has_any_name(self, names: Iterable[str]) -> bool:
+        return any(name in self._names for name in names)
+
+
 class FlagManagerMixin:
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._flags: list[Flag] = []
+        self._flag_index = NameIndex(Flag)
 
     def __contains__(self, flag: str | Flag):
         return self.has_flag(flag)
 
     def has_flag(self, flag: str | Flag):
-        flag = get_name(flag)
-        return any(flag_instance.has_name(flag) for flag_instance in self._flags)
+        return get_name(flag) in self._flag_index
 
     def __getitem__(self, name: str):
         return self.get_flag(name)
 
     def get_flag(self, name: str) -> Flag:
-        return next((flag for flag in self._flags if flag.has_name(name)))
+        return self._flag_index[name]
 
     def get_flags(self, *flag_names: str) -> list[Flag]:
         if not flag_names:
             return self._flags
         else:
-            return [flag for flag in self._flags if flag.has_name_in(flag_names)]
+            return list(dict.fromkeys(self._flag_index[name] for name in flag_names if name in self._flag_index))
 
     def get_active_flags(self) -> Iterable[Flag]:
         return filter(Flag.is_active, self._flags)
@@ -629,57 +613,76 @@ class FlagManagerMixin:
             else:
                 flag.set_to_multi_at_least_one()
 
+        self._flag_index.register(flag)
         self._flags.append(flag)
+        self._adopt(flag)
         return flag
 
     def __len__(self):
         return len(self._flags)
 
-    def filter_flags_out(self, args: list[str], activate=True) -> list[str] | tuple[list[str], list[str]]:
-        chunks = self._chunk_by_flags(args)
+    def filter_flags_out(self, args: list[str], activate=True, scope: NodePlan = None) -> list[str] | tuple[list[str], list[str]]:
+        '''
+        :param scope: Compiled plan of this node. If given, it is used for the flag and node lookups instead of the live tree
+        '''
+        scope = scope or self
+        chunks = self._chunk_by_flags(args, scope)
         parameters = next(chunks, [])
         flags = SmartList()
         for chunk in chunks:
-            parameters += self._filter_flags_out_of_chunk(chunk, activate=activate)
+            parameters += self._filter_flags_out_of_chunk(chunk, scope, activate=activate)
             flags += chunk[0]
         if not activate:
             return parameters, flags
         return parameters
 
-    def _chunk_by_flags(self, args: list[str]) -> Iterator[list[str]]:
+    def _chunk_by_flags(self, args: list[str], scope: FlagManagerMixin | NodePlan) -> Iterator[list[str]]:
         curr_i = 0
-        met_node: VisibleNode | None = None
+        met_node: VisibleNode | NodePlan | None = None
         for i, arg in enumerate(args):
-            if self.has_flag(arg) and not (met_node and met_node.has_flag(arg)):
+            if scope.has_flag(arg) and not (met_node and met_node.has_flag(arg)):
                 yield args[curr_i: i]
                 curr_i = i
-            elif self.has_visible_node(arg):  # TODO: Flag mixin does not have those method - think of refactoring it
-                met_node = self.get_visible_node(arg)
+            elif scope.has_visible_node(arg):  # TODO: Flag mixin does not have those method - think of refactoring it
+                met_node = scope.get_visible_node(arg)
         yield args[curr_i:]
 
-    def _filter_flags_out_of_chunk(self, chunk: list[str], activate=True) -> list[str]:
+    def _filter_flags_out_of_chunk(self, chunk: list[str], scope: FlagManagerMixin | NodePlan, activate=True) -> list[str]:
         flag_name, args = chunk[0], chunk[1:]
-        flag = self.get_flag(flag_name)
+        flag = scope.get_flag(flag_name)
         if activate:
             flag.activate()
         rest = flag.add_to_values(args)
         return rest
 
 
-class ParameterManagerMixin(IResetable):
+class ParameterManagerMixin(IResetable, ParseStateMixin):
     def __init__(self, parameters: Iterable[str | Parameter] = None, storages: tuple[CliCollection] = (), **kwargs):
         super().__init__(**kwargs)
         self._params: dict[str, Parameter] = {}
         self._orders: dict[int, list[str]] = {}
         self._defaults_order: list[str] = []
-        self._disabled_orders: list[int] = []
-        self._used_params: list[Parameter] = []
-        self._arg_count: int | None = None
+        self._order_table: dict[tuple, tuple[Mapping[int, Sequence[str]], tuple[str, ...]]] = {}
+        self._order_table_epoch = -1
         if parameters:
             self.set_params(*parameters, storages=storages)
 
+    def _create_parse_state(self) -> dict[str, Any]:
+        state = super()._create_parse_state()
+        state.update(disabled_orders=[], used_params=[], arg_count=None)
+        return state
+
+    @property
+    def _disabled_orders(self) -> list[int]:
+        return self._get_parse_state()['disabled_orders']
+
+    @property
+    def _used_params(self) -> list[Parameter]:
+        return self._get_parse_state()['used_params']
+
     def reset(self):
-        self._disabled_orders = []
+        self._get_parse_state()['disabled_orders'] = []
+        self._mark_changed()
 
     def has_param(self, param: str | Parameter):
         name = get_name(param)
@@ -692,7 +695,7 @@ class ParameterManagerMixin(IResetable):
         if not param_names:
             return tuple(self._params.values())
         if ' ' in param_names[0]:
-            param_names = shlex.split(param_names[0])
+            param_names = split_args(param_names[0])
         return tuple(self.get_param(name) for name in param_names)
 
     def set_params(self, *parameters: str | CliCollection | Parameter, storages: tuple[CliCollection, ...] = ()) -> None:
@@ -730,6 +733,8 @@ class ParameterManagerMixin(IResetable):
                 to_add.set_to_multi_at_least_one()
 
         self._params[name] = to_add
+        self._adopt(to_add)
+        self._bump_epoch()
         return to_add
 
     def set_possible_param_order(self, line: str) -> None:
@@ -739,10 +744,12 @@ class ParameterManagerMixin(IResetable):
         if count in self._orders:
             raise ValueError
         self._orders[count] = params
+        self._bump_epoch()
 
     # TODO: make order an object with activation Mixin
     def disable_order(self, num: int):
         self._disabled_orders.append(num)
+        self._mark_changed()
 
     # TODO: Consider prioritizing per order (add in before order)
     def set_parameters_to_skip_order(self, *params: str | Parameter, defaults: list[Any] = None):
@@ -750,70 +757,103 @@ class ParameterManagerMixin(IResetable):
         for param, default in zip_longest(params, defaults):
             name = str(param)
             self._defaults_order.append(name)
+            self._bump_epoch()
             if default is not None:
                 self.get_param(name).set_default(default)
 
-    def parse_node_args(self, args: list[str]):  # TODO: separate to methods
+    def parse_node_args(self, args: list[str], orders: Mapping[int, Sequence[str]] = None):  # TODO: separate to methods
+        '''
+        :param orders: Precomputed orders (see get_orders) to use instead of the ones of the node
+        '''
         if not args:
             return
-        self._arg_count = len(args)
-        self._set_default_order_if_not_exist()
-        params_to_use = list(self.get_params_to_use(args))
+        state = self._get_parse_state()
+        state['arg_count'] = len(args)
+        if orders is None:
+            self._set_default_order_if_not_exist()
+            orders = self._orders
+        params_to_use = list(self.get_params_to_use(args, orders))
         self._set_args_to_params(params_to_use, args)
-        self._used_params = params_to_use
+        state['used_params'] = params_to_use
+        self._mark_changed()
 
     def _set_default_order_if_not_exist(self) -> None:
         if not self._orders:
             params = self._params.keys()
             self._orders[len(params)] = list(params)
+            self._bump_epoch()
 
-    def get_params_to_use(self, args: list[str]) -> Iterable[Parameter]:
-        arity = len(args)
-        order = self._get_right_order_for_arity(arity)
+    def get_orders(self) -> dict[int, list[str]]:
+        if not self._orders:
+            return {len(self._params): list(self._params)}
+        return self._orders
+
+    def get_params_to_use(self, args: list[str], orders: Mapping[int, Sequence[str]] = None) -> Iterable[Parameter]:
+        if orders is None:
+            self._set_default_order_if_not_exist()
+            orders = self._orders
+        return map(self.get_param, self._resolve_param_names_to_use(len(args), orders))
+
+    def _resolve_param_names_to_use(self, arity: int, orders: Mapping[int, Sequence[str]]) -> tuple[str, ...]:
+        '''
+        Looks the names up in the table of already resolved arities. The table gets cleared on any change of the structure (see ParseTree.bump)
+        '''
+        epoch = self._get_epoch()
+        if self._order_table_epoch != epoch:
+            self._order_table, self._order_table_epoch = {}, epoch
+        key = (id(orders), arity, tuple(self._disabled_orders), self._get_inactive_params_mask())
+        entry = self._order_table.get(key)
+        if entry is None or entry[0] is not orders:
+            entry = self._order_table[key] = (orders, self._compute_param_names_to_use(arity, orders))
+        return entry[1]
+
+    def _get_inactive_params_mask(self) -> int:
+        return sum(1 << i for i, param in enumerate(self._params.values()) if param.is_inactive())
+
+    def _compute_param_names_to_use(self, arity: int, orders: Mapping[int, Sequence[str]]) -> tuple[str, ...]:
+        order = self._get_right_order_for_arity(arity, orders)
         param_names_to_skip = list(self._get_param_names_to_skip_for(order, arity))
-        param_names_to_use = filter(lambda p: p not in param_names_to_skip, order)
-        params_to_use = map(self.get_param, param_names_to_use)
-        return params_to_use
+        return tuple(filter(lambda p: p not in param_names_to_skip, order))
 
-    def _get_right_order_for_arity(self, arity: int):
-        allowed = list(self.get_allowed_arities())
-        right = self._find_smallest_ge_arity_with_no_lowest_limit_params_at_end(arity, allowed)
+    def _get_right_order_for_arity(self, arity: int, orders: Mapping[int, Sequence[str]]):
+        allowed = list(self.get_allowed_arities(orders))
+        right = self._find_smallest_ge_arity_with_no_lowest_limit_params_at_end(arity, allowed, orders)
         if right is None:
-            right = self._find_multi_param_lt_arity_for_arity(arity, allowed)
+            right = self._find_multi_param_lt_arity_for_arity(arity, allowed, orders)
         if right is None:
             right = self._find_greater_arity_for_arity(arity, allowed)
 
         if not right:
             raise IncorrectArity(arity, '~' + str(allowed))
-        return self._orders[right]
+        return orders[right]
 
-    def get_allowed_arities(self) -> Iterable[int]:
-        return filter(lambda arity: arity not in self._disabled_orders, self._orders.keys())
+    def get_allowed_arities(self, orders: Mapping[int, Sequence[str]] = None) -> Iterable[int]:
+        orders = self._orders if orders is None else orders
+        return filter(lambda arity: arity not in self._disabled_orders, orders.keys())
 
     # ge - greater or equal
-    def _find_smallest_ge_arity_with_no_lowest_limit_params_at_end(self, arity: int, allowed_arities: list[int]):
+    def _find_smallest_ge_arity_with_no_lowest_limit_params_at_end(self, arity: int, allowed_arities: list[int], orders: Mapping[int, Sequence[str]]):
         ge_arities = filter(lambda a: a >= arity, allowed_arities)
-        condition = lambda a: self._is_equal_with_no_lowest_limit_final_params(arity, a)
+        condition = lambda a: self._is_equal_with_no_lowest_limit_final_params(arity, orders[a])
         without_lowest_limit_final_params = filter(condition, ge_arities)
         return min(without_lowest_limit_final_params, default=None)
 
-    def _is_equal_with_no_lowest_limit_final_params(self, arity_to_check: int, order_arity: int) -> bool:
-        order = self._orders[order_arity]
+    def _is_equal_with_no_lowest_limit_final_params(self, arity_to_check: int, order: Sequence[str]) -> bool:
         reversed_params = map(self.get_param, reversed(order))
         true_minimal_arity = len(order) - len(list(takewhile(Parameter.is_without_lowest_limit, reversed_params)))
         return true_minimal_arity <= arity_to_check
 
     # lt - less than
-    def _find_multi_param_lt_arity_for_arity(self, arity: int, allowed_arities: list[int]) -> int | None:
-        with_params = filter(lambda a: bool(self._orders[a]), allowed_arities)
-        multi_param_arities = filter(lambda a: self.get_param(self._orders[a][-1]).is_multi(), with_params)
+    def _find_multi_param_lt_arity_for_arity(self, arity: int, allowed_arities: list[int], orders: Mapping[int, Sequence[str]]) -> int | None:
+        with_params = filter(lambda a: bool(orders[a]), allowed_arities)
+        multi_param_arities = filter(lambda a: self.get_param(orders[a][-1]).is_multi(), with_params)
         smaller_arities = filter(lambda a: a < arity, multi_param_arities)
         return max(smaller_arities, default=None)
 
     def _find_greater_arity_for_arity(self, arity: int, allowed_arities: list[int]) -> int | None:
         return min(filter(lambda a: a > arity, allowed_arities), default=None)
 
-    def _get_param_names_to_skip_for(self, order: list[str], arity: int) -> Iterable[str]:
+    def _get_param_names_to_skip_for(self, order: Sequence[str], arity: int) -> Iterable[str]:
         must_be_skipped = list(self._get_param_names_that_must_be_skipped(order))
         remaining_params_count = len(order) - len(must_be_skipped)
         if arity >= remaining_params_count:
@@ -825,7 +865,7 @@ class ParameterManagerMixin(IResetable):
         needed_to_skip = islice(can_be_skipped, lacking_to_skip)
         return chain(must_be_skipped, needed_to_skip)
 
-    def _get_param_names_that_must_be_skipped(self, from_order: list[str]) -> Iterable[str]:
+    def _get_param_names_that_must_be_skipped(self, from_order: Sequence[str]) -> Iterable[str]:
         return filter(lambda p: self.get_param(p).is_inactive(), from_order)
 
     def _get_param_names_that_can_be_skipped(self, params_to_check: list[str]) -> Iterable[str]:
@@ -834,7 +874,7 @@ class ParameterManagerMixin(IResetable):
         no_lower = filter(Parameter.is_without_lowest_limit, order_params)
         defaults = filter(Parameter.is_default_set, order_params)
         non_prioritized = map(INamable.get_name, chain(no_lower, defaults))
-        return unique_everseen(chain(prioritized_defaults, non_prioritized))
+        return iter(dict.fromkeys(chain(prioritized_defaults, non_prioritized)))
 
     def _set_args_to_params(self, params_to_use: list[Parameter], args: list[str]) -> None:
         for param, arg in zip(params_to_use, args):
@@ -878,6 +918,7 @@ class HiddenNodeManagerMixin:
         node.set_active(active_condition)
         node.add_action(action)
         self._hidden_nodes[name] = node
+        self._adopt(node)
         return self._hidden_nodes[name]
 
     def get_hidden_node(self, name: str) -> HiddenNode:
@@ -913,10 +954,23 @@ class AlternativeNamesMixin(INamable):
 
     def __init__(self, alternative_names: Iterable[str] = None, **kwargs):
         super().__init__(**kwargs)
-        self._alternative_names = set(alternative_names or [])
+        self._alternative_names = frozenset(alternative_names or ())
+        self._name_indexes: tuple[NameIndex, ...] = ()
 
     def add_alternative_names(self, *alternative_names: str):
+        new_names = [name for name in alternative_names if not self.has_name(name)]
+        for index in self._name_indexes:
+            index.check(self, new_names)
+        for index in self._name_indexes:
+            index.register_names(self, new_names)
         self._alternative_names |= set(alternative_names)
+        self._bump_epoch()
+
+    def add_name_index(self, index: NameIndex) -> None:
+        '''
+        The index gets the alternative names added later on and can forbid them
+        '''
+        self._name_indexes += (index,)
 
     def has_name(self, name: str):
         return super().has_name(name) or name in self._alternative_names
@@ -936,22 +990,24 @@ class AlternativeNamesMixin(INamable):
 
 
 class Node(ParameterManagerMixin, IResetable, ActionOnActivationMixin, FlagManagerMixin, HiddenNodeManagerMixin, INamable, IHelp):
+    _visible_nodes: dict[str, VisibleNode] = MappingProxyType({})  # until set in __init__, as the parameters join the tree before
+    _collections: dict[str, CliCollection] = MappingProxyType({})
 
     def __init__(self, name: str, parameters: Iterable[str | Parameter] = None, param_storages: tuple[CliCollection] = (),
                  short_description: str = '', long_description: str = '', **kwargs):
         super().__init__(name=name, parameters=parameters, storages=param_storages, **kwargs)
         self._visible_nodes: dict[str, VisibleNode] = dict()
+        self._visible_node_index = NameIndex(VisibleNode)
         self._collections: dict[str, CliCollection] = dict()
-        self._actions: dict[bool_from_void, SmartList[any_from_void]] = dict()
-        self._action_results: list = []
+        self._actions: dict[bool_from_void, SmartList[NodeAction]] = dict()
         self._only_hidden = False
-        self._help_manager = HelpManager(self)
-        self._help = Help(short_description, long_description)
+        self._help_manager: HelpManager | None = None
+        self._init_help(short_description, long_description)
 
     # Help
 
     def get_help(self) -> Help:
-        return self._help
+        return self._get_own_help()
 
     def get_sub_helps(self) -> dict[HelpType, list[IHelp]]:
         return {
@@ -970,18 +1026,36 @@ class Node(ParameterManagerMixin, IResetable, ActionOnActivationMixin, FlagManag
 
     def _add_general_flag_to_self(self, main: str, *alternative_names: str, action: any_from_void) -> None:
         flag = self.add_flag(main, *alternative_names)
-        action = action or (lambda: self._help_manager.print_help())
+        action = action or (lambda: self.help_manager.print_help())
         self.add_action_when_is_active(action, flag)
 
     @property
     def help_manager(self) -> HelpManager:
+        if self._help_manager is None:
+            from smartcli.nodes.helpManager import HelpManager  # the help builders are loaded only if the help is used
+            self._help_manager = HelpManager(self)
         return self._help_manager
 
+    # Parse state
+
+    def _get_tree_members(self) -> Iterable[ParseStateMixin]:
+        return chain(self._flags, self._params.values(), self._visible_nodes.values(), self._hidden_nodes.values(), self._collections.values())
+
+    def _create_parse_state(self) -> dict[str, Any]:
+        state = super()._create_parse_state()
+        state['action_results'] = []
+        return state
+
+    @property
+    def _action_results(self) -> list:
+        return self._get_parse_state()['action_results']
+
     # Resetable
 
     def reset(self) -> None:
         super().reset()
-        self._action_results = []
+        self._get_parse_state()['action_results'] = []
+        self._mark_changed()
 
     def get_resetable(self) -> set[IResetable]:
         return {self} | self._get_resetable()
@@ -1029,6 +1103,12 @@ class Node(ParameterManagerMixin, IResetable, ActionOnActivationMixin, FlagManag
         except LookupError:
             return False
 
+    def compile(self) -> ParsePlan:
+        '''
+        :return: Immutable plan of the node and its subtree with hash based lookups of nodes and flags. It does not follow later changes of the tree
+        '''
+        return ParsePlan(self)
+
     def apply_to_self_and_all_nodes(self, to_apply: Callable, **kwargs):
         to_apply(self)
         for node in self.get_all_nodes():
@@ -1044,7 +1124,7 @@ class Node(ParameterManagerMixin, IResetable, ActionOnActivationMixin, FlagManag
     # Visible Nodes
     def add_nodes(self, *to_adds: str | VisibleNode, actions: Iterable[Callable] = None):
         actions = actions or []
-        nodes = (self.add_node(to_add, action) for to_add, action in zip_longest(to_adds, actions))
+        nodes = (self.add_node(to_add, action=action) for to_add, action in zip_longest(to_adds, actions))
         return tuple(nodes)
 
     def add_node(self, to_add: str | VisibleNode, *alternative_names: Iterable[str], action: Callable = None) -> VisibleNode:
@@ -1053,24 +1133,19 @@ class Node(ParameterManagerMixin, IResetable, ActionOnActivationMixin, FlagManag
         name, node = get_name_and_object_for_namable(to_add, VisibleNode)
         if name in self._visible_nodes:
             raise ValueAlreadyExistsError(VisibleNode, name)
+        self._visible_node_index.check(node, chain(node.get_all_names(), alternative_names))
         node.add_alternative_names(*alternative_names)
         node.add_action(action)
+        self._visible_node_index.register(node)
         self._visible_nodes[name] = node
+        self._adopt(node)
         return node
 
     def has_visible_node(self, node: str | VisibleNode) -> bool:
-        name = get_name(node)
-        return any(node_instance.has_name(name) for node_instance in self._visible_nodes.values())
+        return get_name(node) in self._visible_node_index
 
     def get_visible_node(self, name: str):
-        try:
-            return self._visible_nodes[name]
-        except KeyError:
-            pass  # Fallback
-        try:
-            return next((node for node in self._visible_nodes.values() if node.has_name(name)))
-        except StopIteration:
-            raise KeyError
+        return self._visible_node_index[name]
 
     def get_visible_nodes(self, *names: str) -> list[VisibleNode]:
         if not names:
@@ -1096,6 +1171,7 @@ class Node(ParameterManagerMixin, IResetable, ActionOnActivationMixin, FlagManag
         if name in self._collections:
             raise ValueAlreadyExistsError(CliCollection, name)
         self._collections[name] = CliCollection(limit, name=name)
+        self._adopt(self._collections[name])
         return self._collections[name]
 
     def get_collection(self, name: str) -> CliCollection:
@@ -1170,20 +1246,46 @@ class Node(ParameterManagerMixin, IResetable, ActionOnActivationMixin, FlagManag
             when_2 = when
             when = lambda: when_2() and not any(param in self._used_params for param in when_no_params)
         self._actions.setdefault(when, SmartList())
-        self._actions[when] += action
+        if action is not None:
+            self._actions[when] += NodeAction(action)
 
     def perform_all_actions(self) -> None:
         for condition, actions in reversed(self._actions.items()):
             if condition():
                 self._perform_actions(actions)
 
-    def _perform_actions(self, actions: Iterable[Callable]):
+    def _perform_actions(self, actions: Iterable[NodeAction]):
         for action in actions:
-            arity = len(signature(action).parameters)
-            params = (param.get() for param in self._params.values())
-            args = list(islice(params, arity))
-            result = action(*args)
+            result = action(self._params)
             self._action_results.append(result)
+            self._mark_changed()
+
+    async def perform_all_actions_async(self, concurrency: int = None) -> None:
+        '''
+        Performs the actions like perform_all_actions, but the awaitable results (of coroutine actions) are awaited concurrently.
+        The results keep the order of the actions
+
+        :param concurrency: The maximal number of awaitables awaited at the same time, no limit if None
+        '''
+        import asyncio
+        semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        to_await = []
+        for condition, actions in reversed(self._actions.items()):
+            if condition():
+                to_await.extend(action(self._params) for action in actions)
+        results = await asyncio.gather(*(self._await_action_result(result, semaphore) for result in to_await))
+        self._action_results.extend(results)
+        self._mark_changed()
+
+    @staticmethod
+    async def _await_action_result(result: Any, semaphore: asyncio.Semaphore | None) -> Any:
+        from inspect import isawaitable
+        if not isawaitable(result):
+            return result
+        if semaphore is None:
+            return await result
+        async with semaphore:
+            return await result
 
     def get_action_results(self):
         return self._action_results
@@ -1211,11 +1313,19 @@ class Root(VisibleNode):
 
     def __init__(self, name: str = 'root', **kwargs):
         super().__init__(name=name, **kwargs)
+        self.get_tree()  # the elements added to the root join its tree at once, so the flags get their bits in add_flag
 
 
-class CliCollection(DefaultStorage, SmartList, INamable, IResetable):
+class CliCollection(DefaultStorage, SmartList, INamable, IResetable, ParseStateMixin):
+    '''
+    List like storage of values. The values are kept in the parse state, the list the class derives from is kept equal to them (see _sync_list).
+    With queue the values are kept in a deque, so taking the first one (see __neg__) is O(1).
+    With compact and a type having an array typecode (see converters.register_bulk_converter), the values are kept in a typed array
+    '''
 
-    def __init__(self, upper_limit: int = None, *, lower_limit=0, default=None, name='', type=None, **kwargs):
+    def __init__(self, upper_limit: int = None, *, lower_limit=0, default=None, name='', type=None, queue=False, compact=False, **kwargs):
+        self._queue = queue
+        self._compact = compact
         super().__init__(name=name, limit=upper_limit, default=default, type=type, **kwargs)
         self._lower_limit = None
         self.set_lower_limit(lower_limit)
@@ -1226,6 +1336,179 @@ class CliCollection(DefaultStorage, SmartList, INamable, IResetable):
     def _get_resetable(self) -> set[IResetable]:
         return set()
 
+    # Parse state
+
+    def _create_parse_state(self) -> dict[str, Any]:
+        state = super()._create_parse_state()
+        state['values'] = self._create_values()
+        self._sync_list(state['values'])
+        return state
+
+    _synced: Sequence = ()
+
+    def _sync_list(self, values: Sequence, appended_from: int = None) -> None:
+        '''
+        Copies the values into the list the class derives from, so the operations of the list type itself (like list + collection or json.dumps) see them.
+        The list holds the values of the context that changed them last
+
+        :param appended_from: If given, the values before the index are already in the list
+        '''
+        if appended_from is not None and self._synced is values:
+            list.extend(self, islice(values, appended_from, None))
+        else:
+            list.__setitem__(self, slice(None), values)
+            self._synced = values
+
+    def _hide_state(self, state: dict[str, Any] | None) -> None:
+        if state is not None and state['values'] is self._synced:
+            context = self.get_tree().find_context()
+            visible = context.find_state(self) if context is not None else None
+            self._sync_list(visible['values'] if visible is not None else ())
+
+    def _create_values(self) -> SmartList | SmartDeque | SmartArray:
+        if self._queue:
+            return SmartDeque(limit=self._limit)
+        typecode = get_typecode(self._type) if self._compact else None
+        if typecode:
+            return SmartArray(typecode, limit=self._limit)
+        return SmartList(limit=self._limit)
+
+    def _values(self) -> SmartList | SmartDeque | SmartArray:
+        return self._get_parse_state()['values']
+
+    def _mark_changed(self) -> None:
+        self._sync_list(self._values())
+        self._mark_values_changed()
+
+    def _mark_values_changed(self) -> None:
+        self._get_parse_state().pop('index', None)
+        super()._mark_changed()
+
+    def _get_index(self) -> CollectionIndex:
+        state = self._get_parse_state()
+        index = state.get('index')
+        if index is None or index.epoch != self._get_epoch():
+            index = state['index'] = CollectionIndex(self.get_tree(), state['values'])
+        return index
+
+    def _add_values(self, add: Callable[[SmartList], Any]) -> Any:
+        '''
+        Adds the values with the given function and updates the index with the added ones instead of dropping it
+        '''
+        state = self._get_parse_state()
+        values, index = state['values'], state.get('index')
+        size = len(values)
+        try:
+            result = add(values)
+        except OverflowError:  # the values do not fit into the typecode of the array, so they are kept in a list from now on
+            if not isinstance(values, SmartArray):
+                raise
+            del values[size:]
+            values = state['values'] = SmartList(*values, limit=self._limit)
+            result = add(values)
+        self._sync_list(values, appended_from=size)
+        self._mark_values_changed()
+        if index is not None and index.epoch == self._get_epoch():
+            index.add_all(values[size:])
+            state['index'] = index
+        return result
+
+    def get_flag_bits(self) -> int | None:
+        '''
+        :return: The bit set of the flags in the collection (see Flag.get_bit) or None if the collection holds anything else than flags or is checked against its defaults
+        '''
+        if not self._is_indexed():
+            return None
+        return self._get_index().flag_bits
+
+    def _is_indexed(self) -> bool:
+        size = len(self._values())
+        return size > 0 and size >= self._lower_limit
+
+    def set_limit(self, limit: int | None):
+        self._limit = limit
+        self._values().set_limit(limit)
+        self._mark_changed()
+
+    def __iadd__(self, elems) -> CliCollection:
+        self._add_values(lambda values: values.__iadd__(elems))
+        return self
+
+    def filter_out(self, elems) -> list:
+        return self._add_values(lambda values: values.filter_out(elems))
+
+    def __neg__(self):
+        values = self._values()
+        first = -values
+        if self._synced is values and list.__len__(self) == len(values) + 1:
+            list.__delitem__(self, 0)
+        else:
+            self._sync_list(values)
+        self._mark_values_changed()
+        return first
+
+    def __len__(self):
+        return len(self._values())
+
+    def __iter__(self):
+        return iter(self._values())
+
+    def __reversed__(self):
+        return reversed(self._values())
+
+    def __getitem__(self, i):
+        return self._values()[i]
+
+    def __setitem__(self, i, value):
+        self._values()[i] = value
+        self._mark_changed()
+
+    def __delitem__(self, i):
+        del self._values()[i]
+        self._mark_changed()
+
+    def __eq__(self, other):
+        if isinstance(other, CliCollection):
+            other = other._values()
+        return self._values() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(self._values())
+
+    def insert(self, i, value) -> None:
+        self._values().insert(i, value)
+        self._mark_changed()
+
+    def remove(self, value) -> None:
+        self._values().remove(value)
+        self._mark_changed()
+
+    def index(self, *args) -> int:
+        return self._values().index(*args)
+
+    def count(self, value) -> int:
+        return self._values().count(value)
+
+    def clear(self) -> None:
+        self._values().clear()
+        self._mark_changed()
+
+    def copy(self) -> list:
+        return self._values().copy()
+
+    def sort(self, **kwargs) -> None:
+        self._values().sort(**kwargs)
+        self._mark_changed()
+
+    def reverse(self) -> None:
+        self._values().reverse()
+        self._mark_changed()
+
+    # Collection
+
     def add_to_add_names(self, *active_elems: ActionOnActivationMixin):
         for active_elem in active_elems:
             active_elem.when_active_add_name_to(self)
@@ -1236,23 +1519,41 @@ class CliCollection(DefaultStorage, SmartList, INamable, IResetable):
 
     def set_lower_limit(self, limit: int | None):
         self._lower_limit = limit or 0
+        self._bump_epoch()
 
     def get_lower_limit(self) -> int:
         return self._lower_limit
 
     def get_nth(self, n: int):
-        return self.get_plain()[n]
+        return self.get_view()[n] if self else self.get_plain()[n]
 
     def get(self) -> Any:
         '''
         :return: As get plain but if the collection has length of 1 gets the only element of it
         '''
+        if self:
+            view = self.get_view()
+            return view[0] if len(view) == 1 else view.to_list()
         to_return = self.get_plain()
         if isinstance(to_return, Sized) and isinstance(to_return, Iterable) and len(to_return) == 1 and not isinstance(to_return, str):
             to_return = next(iter(to_return))
         return to_return
 
+    def get_view(self) -> ValuesView:
+        '''
+        :return: Read-only view of the values or, if there are none, of the default values. The values are not copied
+        '''
+        values = self._values()
+        if not values:
+            return ValuesView(self._get_plain_as_list())
+        if len(values) < self._lower_limit:
+            raise IncorrectArity(len(values), f'> {self._lower_limit}')
+        return ValuesView(values)
+
     def get_as_list(self) -> list[...]:
+        return self.get_view().to_list()
+
+    def _get_plain_as_list(self) -> list[...]:
         try:
             result = self.get_plain()
         except StopIteration:
@@ -1284,8 +1585,18 @@ class CliCollection(DefaultStorage, SmartList, INamable, IResetable):
         return to_return[n] if isinstance(to_return, list) else to_return
 
     def __contains__(self, item):
+        if not self._is_indexed():
+            return self._is_in(item, self.get_view())
+        index = self._get_index()
+        if isinstance(item, Flag):
+            return index.has_any_name(item.get_all_names())
+        if isinstance(item, INamable):
+            item = item.name
+        return index.has(item)
+
+    @staticmethod
+    def _is_in(item, items: Sequence) -> bool:
         if isinstance(item, Flag):
-            items = self.get_as_list()
             names = filter(lambda elem: isinstance(elem, str), items)
             flags = filter(lambda elem: isinstance(elem, Flag), items)
             return item.has_name_in(names) or any(item.has_name_in(flag.get_all_names()) for flag in flags)
@@ -1293,14 +1604,14 @@ class CliCollection(DefaultStorage, SmartList, INamable, IResetable):
         if isinstance(item, INamable):
             item = item.name
 
-        return item in self.get_as_list()
+        return item in items
 
     def __hash__(self):
         return hash(tuple(self))
 
 
 # TODO: create iterface for storage having elems (1)
-class FinalNode(IDefaultStorable, INamable, IResetable, IHelp, ABC):
+class FinalNode(IDefaultStorable, INamable, IResetable, IHelp, ABC, ParseStateMixin):
 
     def __init__(self, name: str, *, storage: CliCollection = None, storage_limit: int | None = -1, storage_lower_limit: int | None = -1,
                  default: default_type = None, type: Callable = None, local_limit=-1, local_lower_limit=-1,
@@ -1318,7 +1629,7 @@ class FinalNode(IDefaultStorable, INamable, IResetable, IHelp, ABC):
         self.set_lower_limit(local_lower_limit)
         self._has_own_storage = False
         self._storage = None
-        self._help = Help(short_description, long_description)
+        self._init_help(short_description, long_description)
 
         if storage is None:
             storage = CliCollection(upper_limit=storage_limit, lower_limit=storage_lower_limit, default=default, type=type)
@@ -1328,7 +1639,7 @@ class FinalNode(IDefaultStorable, INamable, IResetable, IHelp, ABC):
     # Help
 
     def get_help(self) -> Help:
-        return self._help
+        return self._get_own_help()
 
     def get_sub_helps(self) -> dict[HelpType, list[IHelp]]:
         return dict()
@@ -1344,12 +1655,16 @@ class FinalNode(IDefaultStorable, INamable, IResetable, IHelp, ABC):
     def _get_resetable(self) -> set[IResetable]:
         return {self._storage}
 
+    def _get_tree_members(self) -> Iterable[ParseStateMixin]:
+        return (self._storage,) if self._storage is not None else ()
+
     def set_limit(self, limit: int | None, *, storage: CliCollection = None, lower_limit=-1) -> None:
         if storage is not None:
             self.set_storage(storage)
         if lower_limit != -1:
             self.set_lower_limit(lower_limit)
         self._limit = limit
+        self._bump_epoch()
         if self._has_own_storage:
             self._storage.set_limit(limit)
 
@@ -1380,6 +1695,7 @@ class FinalNode(IDefaultStorable, INamable, IResetable, IHelp, ABC):
 
     def set_lower_limit(self, limit: int | None):
         self._lower_limit = limit or 0
+        self._bump_epoch()
 
     def get_lower_limit(self) -> int:
         return self._lower_limit
@@ -1415,14 +1731,16 @@ class FinalNode(IDefaultStorable, INamable, IResetable, IHelp, ABC):
             return to_add[:free], to_add[free:]
         return to_add, []
 
-    def _map_to_type(self, to_cast: Iterable):
+    def _map_to_type(self, to_cast: list):
         if not self.type:
             return to_cast
-        return (self.type(elem) for elem in to_cast if elem)
+        return convert_all(self.type, list(filter(None, to_cast)))
 
     def set_storage(self, storage: CliCollection):
         if storage is not None:
             self._storage = storage
+            self._adopt(storage)
+            self._bump_epoch()
 
     def get_storage(self) -> CliCollection:
         return self._storage
@@ -1459,10 +1777,8 @@ class FinalNode(IDefaultStorable, INamable, IResetable, IHelp, ABC):
         '''
         :return: As get plain but if the collection has length of 1 gets the only element of it
         '''
-        to_return = self.get_plain()
-        if isinstance(to_return, Sized) and isinstance(to_return, Iterable) and len(to_return) == 1:
-            to_return = next(iter(to_return))
-        return to_return
+        view = self.get_view()
+        return view[0] if len(view) == 1 else view.to_list()
 
     def get_as_list(self) -> list[...]:
         return self._storage.get_as_list()
@@ -1471,15 +1787,16 @@ class FinalNode(IDefaultStorable, INamable, IResetable, IHelp, ABC):
         '''
         :return: Return truncated to the limit values of the collection or if there are no values, returns the default values
         '''
-        to_return = self._storage.get_as_list()
-        if isinstance(to_return, Sized):
-            if self._limit is not None and self._limit < len(to_return):
-                to_return = to_return[:self._limit]
-            if len(to_return) < self._lower_limit:
-                raise IncorrectArity(len(to_return), f'> {self._lower_limit}')
-        elif self._lower_limit > 1:
-            raise IncorrectArity(1, f'> {self._lower_limit}')
-        return to_return
+        return self.get_view().to_list()
+
+    def get_view(self) -> ValuesView:
+        '''
+        :return: Read-only view of the values of the storage (or of its defaults) truncated to the limit. The values are not copied
+        '''
+        view = self._storage.get_view().limit(self._limit)
+        if len(view) < self._lower_limit:
+            raise IncorrectArity(len(view), f'> {self._lower_limit}')
+        return view
 
 
 class Parameter(FinalNode, ActionOnCondition):
@@ -1503,6 +1820,11 @@ class Parameter(FinalNode, ActionOnCondition):
 
 
 class Flag(FinalNode, ActionOnImplicitActivation, AlternativeNamesMixin):
+    '''
+    The activity of a flag is a bit of the bit set of active flags of the parse context (see get_bit)
+    '''
+
+    _bit: int | None = None
 
     def __init__(self, name, *alternative_names: str, storage: CliCollection = None, storage_limit: int = -1, storage_lower_limit=-1, default: default_type = None, flag_limit=-1, flag_lower_limit=-1):
         if flag_limit == -1:
@@ -1510,7 +1832,46 @@ class Flag(FinalNode, ActionOnImplicitActivation, AlternativeNamesMixin):
             flag_limit = limit if limit != -1 else 0
 
         super().__init__(name, alternative_names=alternative_names, storage=storage, storage_limit=storage_limit, storage_lower_limit=storage_lower_limit, default=default, local_limit=flag_limit, local_lower_limit=flag_lower_limit, activated=False)
-        self._on_activation: SmartList[Callable] = SmartList()
+
+    # Activation
+
+    def get_bit(self) -> int:
+        '''
+        :return: The bit of the flag in its tree, assigned when the flag joins the tree (see ParseTree.assign_bit)
+        '''
+        if self._bit is None:
+            return self.get_tree().assign_bit(self)
+        return self._bit
+
+    def get_mask(self) -> int:
+        return 1 << self.get_bit()
+
+    @property
+    def _activated(self) -> bool:
+        return self._get_context().active_flags & self.get_mask() != 0
+
+    def set_activated(self, val: bool):
+        context = self._get_context()
+        context.active_flags = context.active_flags | self.get_mask() if val else context.active_flags & ~self.get_mask()
+        self._mark_changed()
+
+    def _join_tree(self, tree: ParseTree) -> None:
+        old = self._tree
+        if old is tree:
+            return
+        old_context = old.find_context() if old is not None else None
+        active = old_context is not None and self._activated
+        if active:
+            old_context.active_flags &= ~self.get_mask()
+        self._bit = None
+        super()._join_tree(tree)
+        tree.assign_bit(self)
+        if active:
+            tree.get_context().active_flags |= self.get_mask()
+
+    @staticmethod
+    def get_mask_of(flags: Iterable[Flag]) -> int:
+        return reduce(op.or_, map(Flag.get_mask, flags), 0)
 
     # Help
 
@@ -1518,7 +1879,7 @@ class Flag(FinalNode, ActionOnImplicitActivation, AlternativeNamesMixin):
         return self.get_all_names()
 
     def get_long_description(self) -> str:
-        if self.help.long_description is not None:
+        if self._read_help().long_description is not None:
             return super().get_long_description()
         raise NotImplementedError
 
@@ -1546,7 +1907,11 @@ def get_name(arg: str | INamable) -> str:
 
 def storable_has_value(storable: IDefaultStorable, value: Any):
     try:
-        result = storable.get()
+        if isinstance(storable, (CliCollection, FinalNode)):
+            view = storable.get_view()
+            result = view[0] if len(view) == 1 else view
+        else:
+            result = storable.get()
         return result == value or value in result
     except StopIteration:
         return False
\ No newline at end of file
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Callable, Hashable, Iterable, Mapping, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from smartcli.nodes.cli_elements import CliCollection, Flag, IActivable
+    from smartcli.nodes.parseContext import ParseTree
+
+
+class Condition(ABC):
+    '''
+    Condition that declares the elements it reads (see get_inputs), so it has to be evaluated again only after one of them changes.
+    Conditions are callables, so they can be used wherever a plain callable condition is accepted
+    '''
+
+    __slots__ = ()
+
+    @abstractmethod
+    def __call__(self) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_inputs(self) -> tuple | None:
+        '''
+        :return: The elements the condition reads or None if they are unknown
+        '''
+        raise NotImplementedError
+
+    def get_atoms(self) -> tuple[AtomCondition, ...] | None:
+        '''
+        :return: The elementary conditions the condition is built of or None if it cannot be broken down into them
+        '''
+        return None
+
+    def evaluate_with(self, values: Mapping[Hashable, bool]) -> bool:
+        '''
+        Evaluates the condition for the given values of its atoms (see get_atoms), keyed by AtomCondition.key
+        '''
+        raise NotImplementedError
+
+    def __and__(self, other: Callable[[], bool]) -> Combined:
+        return All(self, other)
+
+    def __or__(self, other: Callable[[], bool]) -> Combined:
+        return Any(self, other)
+
+    def __invert__(self) -> Not:
+        return Not(self)
+
+
+class AtomCondition(Condition, ABC):
+    '''
+    Condition that reads a single value
+    '''
+
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def key(self) -> Hashable:
+        '''
+        Equal for the atoms reading the same value
+        '''
+        raise NotImplementedError
+
+    def get_atoms(self) -> tuple[AtomCondition, ...] | None:
+        return self,
+
+    def evaluate_with(self, values: Mapping[Hashable, bool]) -> bool:
+        return values[self.key]
+
+
+class FlagActive(AtomCondition):
+    __slots__ = ('_activable',)
+
+    def __init__(self, activable: IActivable):
+        self._activable = activable
+
+    @property
+    def activable(self) -> IActivable:
+        return self._activable
+
+    @property
+    def key(self) -> Hashable:
+        return 'active', id(self._activable)
+
+    def get_atoms(self) -> tuple[AtomCondition, ...] | None:
+        get_condition_atoms = getattr(self._activable, 'get_condition_atoms', None)
+        return get_condition_atoms() if get_condition_atoms else (self,)
+
+    def evaluate_with(self, values: Mapping[Hashable, bool]) -> bool:
+        is_active_with = getattr(self._activable, 'is_active_with', None)
+        return is_active_with(values) if is_active_with else values[self.key]
+
+    def __call__(self) -> bool:
+        return self._activable.is_active()
+
+    def get_inputs(self) -> tuple | None:
+        get_condition_inputs = getattr(self._activable, 'get_condition_inputs', None)
+        return get_condition_inputs() if get_condition_inputs else (self._activable,)
+
+
+class InCollection(AtomCondition):
+    __slots__ = ('_collection', '_elem')
+
+    def __init__(self, collection: CliCollection, elem):
+        self._collection = collection
+        self._elem = elem
+
+    @property
+    def key(self) -> Hashable:
+        return 'in', id(self._collection), self._elem if isinstance(self._elem, str) else id(self._elem)
+
+    def __call__(self) -> bool:
+        return self._elem in self._collection
+
+    def get_inputs(self) -> tuple | None:
+        return self._collection,
+
+
+class NotEmpty(AtomCondition):
+    __slots__ = ('_collection',)
+
+    def __init__(self, collection: CliCollection):
+        self._collection = collection
+
+    @property
+    def key(self) -> Hashable:
+        return 'not_empty', id(self._collection)
+
+    def __call__(self) -> bool:
+        return len(self._collection) > 0
+
+    def get_inputs(self) -> tuple | None:
+        return self._collection,
+
+
+class FlagsCondition(Condition, ABC):
+    '''
+    Condition on many flags checked with bitwise operations on the bits of the flags in their tree (see Flag.get_bit)
+    '''
+
+    __slots__ = ('_flags', '_func', '_mask')
+
+    def __init__(self, flags: tuple[Flag, ...], func: Callable[[Iterable[bool]], bool]):
+        self._flags = flags
+        self._func = func
+        self._mask: tuple[int, int | None] = (0, None)  # the epoch of the tree and the bit set of the flags in it
+
+    def _get_mask(self, tree: ParseTree) -> int | None:
+        '''
+        :return: The bit set of the flags in the tree or None if any of them is of another tree. It is computed again only after the tree changes
+        '''
+        epoch, mask = self._mask
+        if epoch != tree.epoch:
+            epoch, mask = tree.epoch, 0
+            for flag in self._flags:
+                if flag.get_tree() is not tree:
+                    mask = None
+                    break
+                mask |= flag.get_mask()
+            self._mask = epoch, mask
+        return mask
+
+
+class FlagsActive(FlagsCondition):
+    '''
+    Checks if any (or all) of the flags are active with a single bitwise operation on the bit set of the active flags of their tree
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, *flags: Flag, func: Callable[[Iterable[bool]], bool] = any):
+        if func not in (any, all):
+            raise ValueError
+        super().__init__(flags, func)
+
+    def __call__(self) -> bool:
+        if not self._flags:
+            return self._func(())
+        tree = self._flags[0].get_tree()
+        mask = self._get_mask(tree)
+        if mask is None:  # the flags of other trees are active in other contexts
+            return self._func(flag.is_active() for flag in self._flags)
+        active = tree.get_context().active_flags & mask
+        return active == mask if self._func is all else active != 0
+
+    def get_inputs(self) -> tuple | None:
+        return self._flags
+
+    def get_atoms(self) -> tuple[AtomCondition, ...] | None:
+        return tuple(map(FlagActive, self._flags))
+
+    def evaluate_with(self, values: Mapping[Hashable, bool]) -> bool:
+        return self._func(atom.evaluate_with(values) for atom in self.get_atoms())
+
+
+class FlagsInCollection(FlagsCondition):
+    '''
+    Checks if any (or all) of the flags are in the collection. If the collection holds only flags of its tree, it is a single bitwise operation (see CliCollection.get_flag_bits)
+    '''
+
+    __slots__ = ('_collection',)
+
+    def __init__(self, collection: CliCollection, *flags: Flag, func: Callable[[Iterable[bool]], bool] = all):
+        super().__init__(flags, func)
+        self._collection = collection
+
+    def __call__(self) -> bool:
+        bits = self._collection.get_flag_bits() if self._func in (any, all) else None
+        mask = self._get_mask(self._collection.get_tree()) if bits is not None else None
+        if mask is None:
+            return self._func([flag in self._collection for flag in self._flags])
+        return bits & mask == mask if self._func is all else bits & mask != 0
+
+    def get_inputs(self) -> tuple | None:
+        return self._collection,
+
+    def get_atoms(self) -> tuple[AtomCondition, ...] | None:
+        return tuple(InCollection(self._collection, flag) for flag in self._flags)
+
+    def evaluate_with(self, values: Mapping[Hashable, bool]) -> bool:
+        return self._func([atom.evaluate_with(values) for atom in self.get_atoms()])
+
+
+class Not(Condition):
+    __slots__ = ('_condition',)
+
+    def __init__(self, condition: Callable[[], bool]):
+        self._condition = condition
+
+    def __call__(self) -> bool:
+        return not self._condition()
+
+    def get_inputs(self) -> tuple | None:
+        return get_inputs_of(self._condition)
+
+    def get_atoms(self) -> tuple[AtomCondition, ...] | None:
+        return get_atoms_of(self._condition)
+
+    def evaluate_with(self, values: Mapping[Hashable, bool]) -> bool:
+        return not self._condition.evaluate_with(values)
+
+
+class Combined(Condition):
+    '''
+    Applies the function (like all or any) to the results of the conditions
+    '''
+
+    __slots__ = ('_func', '_conditions')
+
+    def __init__(self, func: Callable[[Iterable[bool]], bool], *conditions: Callable[[], bool]):
+        self._func = func
+        self._conditions = conditions
+
+    def __call__(self) -> bool:
+        return self._func([condition() for condition in self._conditions])
+
+    def get_inputs(self) -> tuple | None:
+        inputs = []
+        for condition in self._conditions:
+            condition_inputs = get_inputs_of(condition)
+            if condition_inputs is None:
+                return None
+            inputs.extend(condition_inputs)
+        return tuple(inputs)
+
+    def get_atoms(self) -> tuple[AtomCondition, ...] | None:
+        return get_atoms_of_all(self._conditions)
+
+    def evaluate_with(self, values: Mapping[Hashable, bool]) -> bool:
+        return self._func([condition.evaluate_with(values) for condition in self._conditions])
+
+
+class All(Combined):
+    __slots__ = ()
+
+    def __init__(self, *conditions: Callable[[], bool]):
+        super().__init__(all, *conditions)
+
+    def __call__(self) -> bool:
+        return all(condition() for condition in self._conditions)
+
+    def evaluate_with(self, values: Mapping[Hashable, bool]) -> bool:
+        return all(condition.evaluate_with(values) for condition in self._conditions)
+
+
+class Any(Combined):
+    __slots__ = ()
+
+    def __init__(self, *conditions: Callable[[], bool]):
+        super().__init__(any, *conditions)
+
+    def __call__(self) -> bool:
+        return any(condition() for condition in self._conditions)
+
+    def evaluate_with(self, values: Mapping[Hashable, bool]) -> bool:
+        return any(condition.evaluate_with(values) for condition in self._conditions)
+
+
+def get_inputs_of(condition: Callable[[], bool]) -> tuple | None:
+    return condition.get_inputs() if isinstance(condition, Condition) else None
+
+
+def get_atoms_of(condition: Callable[[], bool]) -> tuple[AtomCondition, ...] | None:
+    return condition.get_atoms() if isinstance(condition, Condition) else None
+
+
+def get_atoms_of_all(conditions: Iterable[Callable[[], bool]]) -> tuple[AtomCondition, ...] | None:
+    '''
+    :return: The atoms of all the conditions, one per key, or None if any of the conditions cannot be broken down
+    '''
+    atoms = {}
+    for condition in conditions:
+        condition_atoms = get_atoms_of(condition)
+        if condition_atoms is None:
+            return None
+        for atom in condition_atoms:
+            atoms.setdefault(atom.key, atom)
+    return tuple(atoms.values())
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from array import array, typecodes
+from typing import Callable, Sequence
+
+
+class BulkConverter:
+    '''
+    Converts a whole chunk of arguments in one call. If it has a typecode, the converted values fit into an array of it (see the array module)
+    '''
+
+    __slots__ = ('convert', 'typecode')
+
+    def __init__(self, convert: Callable[[Sequence], Sequence], typecode: str = None):
+        self.convert = convert
+        self.typecode = typecode
+
+
+_converters: dict[Callable, BulkConverter] = {}
+
+
+def register_bulk_converter(type: Callable, convert: Callable[[Sequence], Sequence], typecode: str = None) -> None:
+    '''
+    Registers the function converting a chunk of arguments to the values of the type, used instead of calling the type for every argument
+    '''
+    _converters[type] = BulkConverter(convert, typecode)
+
+
+def unregister_bulk_converter(type: Callable) -> None:
+    _converters.pop(type, None)
+
+
+def get_bulk_converter(type: Callable) -> BulkConverter | None:
+    converter = _converters.get(type)
+    if converter is None and getattr(type, '__module__', None) == 'numpy' and _register_numpy_converters():
+        converter = _converters.get(type)
+    return converter
+
+
+def get_typecode(type: Callable) -> str | None:
+    converter = get_bulk_converter(type)
+    return converter.typecode if converter else None
+
+
+def convert_all(type: Callable, values: Sequence) -> Sequence:
+    '''
+    Converts the values with the bulk converter of the type or one by one if there is none
+    '''
+    converter = get_bulk_converter(type)
+    return converter.convert(values) if converter else [type(value) for value in values]
+
+
+def _create_array_converter(type: Callable, typecode: str) -> Callable[[Sequence], Sequence]:
+    def convert(values: Sequence) -> Sequence:
+        try:
+            return array(typecode, map(type, values))
+        except OverflowError:
+            return list(map(type, values))
+    return convert
+
+
+def _create_numpy_converter(type: Callable, asarray: Callable) -> Callable[[Sequence], Sequence]:
+    return lambda values: asarray(values, dtype=type)
+
+
+_numpy_registered = False
+
+
+def _register_numpy_converters() -> bool:
+    '''
+    Registers the converters of the NumPy types on the first lookup of any of them, so NumPy is imported only by the programs using it
+    :return: If the converters got registered now
+    '''
+    global _numpy_registered
+    if _numpy_registered:
+        return False
+    _numpy_registered = True
+    import numpy
+    for numpy_type in (numpy.int8, numpy.int16, numpy.int32, numpy.int64, numpy.uint8, numpy.uint16, numpy.uint32, numpy.uint64, numpy.float32, numpy.float64):
+        if numpy_type not in _converters:  # keeps the converters registered by the user
+            char = numpy.dtype(numpy_type).char
+            register_bulk_converter(numpy_type, _create_numpy_converter(numpy_type, numpy.asarray), char if char in typecodes else None)
+    return True
+
+
+register_bulk_converter(int, _create_array_converter(int, 'q'), 'q')
+register_bulk_converter(float, _create_array_converter(float, 'd'), 'd')
+
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+from contextvars import ContextVar, Token
+from itertools import count
+from threading import Lock
+from typing import Any, Callable, Iterable, Mapping, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from smartcli.nodes.cli_elements import Flag, Node
+    from smartcli.tokenizer import Tokenizer
+
+T = TypeVar('T')
+
+_epochs = count(1)
+_bits_lock = Lock()
+
+
+class ParseTree:
+    '''
+    The elements of a single tree (see ParseStateMixin.get_tree). While a context of the tree is entered (per thread and per asyncio task),
+    the elements keep their state in it. Out of any parse they keep it in the context of the last parse of the tree (see bind)
+    or, if there is none, in the detached context of the tree
+    '''
+
+    __slots__ = ('_bound', '_detached', '_next_bit', 'epoch')
+
+    def __init__(self):
+        self._bound: ParseContext | None = None
+        self._detached: ParseContext | None = None
+        self._next_bit = 0
+        self.epoch = next(_epochs)
+
+    def bump(self) -> None:
+        '''
+        Marks a change of the structure of the tree (orders, limits, defaults, storages, conditions, names) that the cached parsing decisions depend on.
+        The epochs are unique in the process, so the cache of an element that moved from another tree is never taken for valid
+        '''
+        self.epoch = next(_epochs)
+
+    def assign_bit(self, flag: Flag) -> int:
+        '''
+        Gives the flag the next free bit of the tree, unless it already has one. The flags of different trees may share the bits
+        '''
+        with _bits_lock:
+            if flag._bit is None:
+                flag._bit = self._next_bit
+                self._next_bit += 1
+            return flag._bit
+
+    def get_entered(self) -> ParseContext | None:
+        return ParseContext._entered.get().get(self)
+
+    def get_context(self) -> ParseContext:
+        context = ParseContext._entered.get().get(self)
+        if context is not None:
+            return context
+        if self._bound is not None:
+            return self._bound
+        if self._detached is None:
+            self._detached = ParseContext(self)
+        return self._detached
+
+    def find_context(self) -> ParseContext | None:
+        '''
+        :return: The context get_context would return, but None instead of creating the detached one
+        '''
+        context = self.get_entered()
+        if context is None:
+            context = self._bound if self._bound is not None else self._detached
+        return context
+
+    def get_bound(self) -> ParseContext | None:
+        return self._bound
+
+    def bind(self, context: ParseContext) -> None:
+        '''
+        Makes the state of the context visible out of any parse, until the next bind or unbind
+        '''
+        hidden = self._bound if self._bound is not None else self._detached
+        self._bound = context
+        if hidden is not None and hidden is not context:
+            hidden.hide()
+
+    def unbind(self, context: ParseContext = None) -> None:
+        '''
+        :param context: If given, the tree is unbound only if this context is the bound one
+        '''
+        bound = self._bound
+        if bound is not None and (context is None or bound is context):
+            self._bound = None
+            bound.hide()
+
+    def get_detached(self) -> ParseContext | None:
+        return self._detached
+
+    def drop_detached(self) -> None:
+        '''
+        Drops the state the elements of the tree got out of any parse, which brings them back to their initial state
+        '''
+        detached, self._detached = self._detached, None
+        if detached is not None:
+            detached.hide()
+
+    def evaluate_once(self, owner: object, evaluate: Callable[[], T], inputs: tuple = None) -> T:
+        '''
+        Evaluates at most once per parse until the state changes (see ParseContext.evaluate_once). While no parse of the tree is running,
+        it always evaluates, as the conditions may read a state that changed out of the parse
+        '''
+        context = self.get_context()
+        if not context.parsing:
+            return evaluate()
+        return context.evaluate_once(owner, evaluate, inputs)
+
+
+class ParseContext:
+    '''
+    Mutable state of a single parse of a tree. While a context is entered (per thread and per asyncio task), the elements of its tree
+    keep their state in it, so a tree can serve many parses at the same time. The contexts of other trees stay as they were
+    '''
+
+    _entered: ContextVar[Mapping[ParseTree, ParseContext]] = ContextVar('entered_parse_contexts', default={})
+
+    def __init__(self, tree: ParseTree = None):
+        self.tree = tree
+        self._states: dict[int, dict[str, Any]] = {}
+        self._owners: list[ParseStateMixin] = []  # keeps the ids of the owners valid
+        self._tokens: list[Token] = []
+        self.args: list[str] = []
+        self.tokens: Tokenizer | None = None
+        self.active_nodes: list[Node] = []
+        self.action_node: Node | None = None
+        self.used_arity = 0
+        self.active_flags = 0  # bit set of the active flags (see Flag.get_bit)
+        self.parsing = False
+        self._conditions: dict[int, tuple[int | tuple[int, ...], Any, object]] = {}
+        self._condition_epoch = 0
+        self._versions: dict[int, int] = {}
+
+    def __enter__(self) -> ParseContext:
+        self._tokens.append(self._entered.set({**self._entered.get(), self.tree: self}))
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._entered.reset(self._tokens.pop())
+
+    def is_entered(self) -> bool:
+        return bool(self._tokens)
+
+    def start_parsing(self) -> None:
+        self.parsing = True
+
+    def stop_parsing(self) -> None:
+        '''
+        Ends the caching of the evaluated conditions (see evaluate_once) and drops the cached values
+        '''
+        self.parsing = False
+        self._conditions.clear()
+
+    def set_used_arity(self, arity: int) -> None:
+        '''
+        Sets the arity and marks its change, as the conditions may read it (see evaluate_once)
+        '''
+        if arity != self.used_arity:
+            self.used_arity = arity
+            self.mark_changed(self)
+
+    def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        with self:
+            return func(*args, **kwargs)
+
+    def get_state(self, owner: ParseStateMixin) -> dict[str, Any]:
+        try:
+            return self._states[id(owner)]
+        except KeyError:
+            state = self._states[id(owner)] = owner._create_parse_state()
+            self._keep(owner)
+            return state
+
+    def find_state(self, owner: ParseStateMixin) -> dict[str, Any] | None:
+        return self._states.get(id(owner))
+
+    def _keep(self, owner: ParseStateMixin) -> None:
+        self._owners.append(owner)
+
+    def pop_state(self, owner: ParseStateMixin) -> dict[str, Any] | None:
+        return self._states.pop(id(owner), None)
+
+    def put_state(self, owner: ParseStateMixin, state: dict[str, Any]) -> None:
+        if id(owner) not in self._states:
+            self._keep(owner)
+        self._states[id(owner)] = state
+
+    def get_touched(self) -> list[ParseStateMixin]:
+        return list(self._owners)
+
+    def hide(self) -> None:
+        '''
+        Tells the touched elements their state in this context is no longer visible (see ParseStateMixin._hide_state)
+        '''
+        for owner in self._owners:
+            owner._hide_state(self._states.get(id(owner)))
+
+    def evaluate_once(self, owner: object, evaluate: Callable[[], T], inputs: tuple = None) -> T:
+        '''
+        Returns the value evaluated for the owner before, unless it may have changed since then (see mark_changed)
+
+        :param inputs: The elements the evaluation depends on. Only their changes make it evaluate again.
+        If None, any change does
+        '''
+        key = self._condition_epoch if inputs is None else tuple(self._versions.get(id(elem), 0) for elem in inputs)
+        cached = self._conditions.get(id(owner))
+        if cached is not None and cached[0] == key and cached[2] is owner:
+            return cached[1]
+        value = evaluate()
+        self._conditions[id(owner)] = (key, value, owner)
+        return value
+
+    def mark_changed(self, elem: object) -> None:
+        self._versions[id(elem)] = self._versions.get(id(elem), 0) + 1
+        self._condition_epoch += 1
+
+    def __len__(self):
+        return len(self._states)
+
+
+class ParseStateMixin:
+    '''
+    Element with a state that changes while parsing. The state is kept in the context of the tree of the element (see ParseTree.get_context).
+    An element gets the tree of the element it is added to (see _adopt), an element out of any tree gets its own one on the first use
+    '''
+
+    _tree: ParseTree | None = None
+
+    def get_tree(self) -> ParseTree:
+        if self._tree is None:
+            self._join_tree(ParseTree())
+        return self._tree
+
+    def _adopt(self, *members: ParseStateMixin) -> None:
+        '''
+        Makes the members, with their own members, a part of the tree of this element. Until any of them needs a tree, the trees are not created
+        '''
+        if self._tree is None and all(member._tree is None for member in members):
+            return
+        tree = self.get_tree()
+        for member in members:
+            member._join_tree(tree)
+
+    def _join_tree(self, tree: ParseTree) -> None:
+        old = self._tree
+        if old is tree:
+            return
+        self._tree = tree
+        tree.bump()
+        if old is not None:
+            old.bump()
+        old_context = old.find_context() if old is not None else None
+        if old_context is not None:
+            self._move_state(old_context, tree.get_context())
+        for member in self._get_tree_members():
+            member._join_tree(tree)
+
+    def _get_tree_members(self) -> Iterable[ParseStateMixin]:
+        return ()
+
+    def _move_state(self, old: ParseContext, new: ParseContext) -> None:
+        if old is not new and (state := old.pop_state(self)) is not None:
+            new.put_state(self, state)
+
+    def _get_epoch(self) -> int:
+        return self.get_tree().epoch
+
+    def _bump_epoch(self) -> None:
+        if self._tree is not None:  # without a tree nothing could be cached for it
+            self._tree.bump()
+
+    def _get_context(self) -> ParseContext:
+        return self.get_tree().get_context()
+
+    def _create_parse_state(self) -> dict[str, Any]:
+        return {}
+
+    def _hide_state(self, state: dict[str, Any] | None) -> None:
+        '''
+        Called when the context of the state stops being visible, the state is None if it moved to another tree
+        '''
+
+    def _get_parse_state(self) -> dict[str, Any]:
+        return self.get_tree().get_context().get_state(self)
+
+    def _mark_changed(self) -> None:
+        self.get_tree().get_context().mark_changed(self)
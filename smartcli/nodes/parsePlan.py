@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Mapping, Sequence, TYPE_CHECKING
+
+from smartcli.exceptions import ParsingException
+from smartcli.nodes.conditions import AtomCondition
+
+if TYPE_CHECKING:
+    from smartcli.nodes.cli_elements import Node, Flag, HiddenNode
+
+
+class HiddenNodeTable:
+    '''
+    Decision table of the active hidden node, keyed by the bit mask of the atoms of the conditions of the hidden nodes (see conditions.AtomCondition).
+    It can be built only if all the conditions are declarative and have at most max_atoms atoms in total
+    '''
+
+    __slots__ = ('_atoms', '_indexes', '_ambiguities')
+
+    max_atoms = 12
+    _none = -1
+    _ambiguous = -2
+
+    def __init__(self, atoms: Sequence[AtomCondition], hidden_nodes: Sequence[HiddenNode]):
+        self._atoms = tuple(atoms)
+        self._indexes: list[int] = []
+        self._ambiguities: dict[int, tuple[str, ...]] = {}
+        for mask in range(1 << len(self._atoms)):
+            values = {atom.key: bool(mask >> i & 1) for i, atom in enumerate(self._atoms)}
+            active = [i for i, node in enumerate(hidden_nodes) if node.is_active_with(values)]
+            if len(active) > 1:
+                self._ambiguities[mask] = tuple(hidden_nodes[i].name for i in active)
+            self._indexes.append(active[0] if len(active) == 1 else self._ambiguous if active else self._none)
+
+    @classmethod
+    def create(cls, hidden_nodes: Sequence[HiddenNode]) -> HiddenNodeTable | None:
+        atoms: dict = {}
+        for node in hidden_nodes:
+            node_atoms = node.get_condition_atoms()
+            if node_atoms is None:
+                return None
+            for atom in node_atoms:
+                atoms.setdefault(atom.key, atom)
+        if len(atoms) > cls.max_atoms:
+            return None
+        return cls(tuple(atoms.values()), hidden_nodes)
+
+    def get_atoms(self) -> tuple[AtomCondition, ...]:
+        return self._atoms
+
+    def get_mask(self) -> int:
+        mask = 0
+        for i, atom in enumerate(self._atoms):
+            if atom():
+                mask |= 1 << i
+        return mask
+
+    def find_index(self) -> int | None:
+        '''
+        :return: The index of the active hidden node or None if there is no active one
+        '''
+        index = self._indexes[self.get_mask()]
+        if index == self._ambiguous:
+            raise ParsingException("More than one hidden node is active")
+        return index if index != self._none else None
+
+    def get_ambiguities(self) -> Mapping[int, tuple[str, ...]]:
+        '''
+        :return: The masks for which more than one hidden node would be active, with the names of the nodes
+        '''
+        return MappingProxyType(self._ambiguities)
+
+
+class NodePlan:
+    '''
+    Frozen, hash-based snapshot of a single node. Exposes the lookups the parser needs, each being a single dict hit
+    '''
+
+    __slots__ = ('_node', '_flags', '_visible_nodes', '_hidden_nodes', '_hidden_table', '_orders')
+
+    def __init__(self, node: Node):
+        self._node = node
+        flags: dict[str, Flag] = {}
+        for flag in node.get_flags():
+            for name in flag.get_all_names():
+                flags.setdefault(name, flag)
+        self._flags: Mapping[str, Flag] = MappingProxyType(flags)
+        self._orders: Mapping[int, tuple[str, ...]] = MappingProxyType({arity: tuple(order) for arity, order in node.get_orders().items()})
+        self._visible_nodes: Mapping[str, NodePlan] = MappingProxyType({})
+        self._hidden_nodes: tuple[NodePlan, ...] = ()
+        self._hidden_table: HiddenNodeTable | None = None
+
+    def _link(self, visible_nodes: dict[str, NodePlan], hidden_nodes: tuple[NodePlan, ...]) -> None:
+        self._visible_nodes = MappingProxyType(visible_nodes)
+        self._hidden_nodes = hidden_nodes
+        self._hidden_table = HiddenNodeTable.create([plan.node for plan in hidden_nodes]) if hidden_nodes else None
+
+    @property
+    def node(self) -> Node:
+        return self._node
+
+    def has_flag(self, name: str) -> bool:
+        return name in self._flags
+
+    def get_flag(self, name: str) -> Flag:
+        return self._flags[name]
+
+    def has_visible_node(self, name: str) -> bool:
+        return name in self._visible_nodes
+
+    def get_visible_node(self, name: str) -> NodePlan:
+        return self._visible_nodes[name]
+
+    def find_visible_node(self, name: str) -> NodePlan | None:
+        return self._visible_nodes.get(name)
+
+    def get_hidden_nodes(self) -> tuple[NodePlan, ...]:
+        return self._hidden_nodes
+
+    def get_hidden_table(self) -> HiddenNodeTable | None:
+        return self._hidden_table
+
+    def find_active_hidden_node(self) -> NodePlan | None:
+        '''
+        Looks the active hidden node up in the decision table (see HiddenNodeTable) if the node has one, otherwise evaluates the hidden nodes
+        '''
+        if self._hidden_table is None:
+            if not self._hidden_nodes or not self._node.has_active_hidden_node():
+                return None
+            active = self._node.get_active_hidden_node()
+            return next(plan for plan in self._hidden_nodes if plan.node is active)
+        index = self._hidden_table.find_index()
+        if index is None:
+            return None
+        found = self._hidden_nodes[index]
+        found.node.is_active()  # performs the actions on activation
+        return found
+
+    def get_orders(self) -> Mapping[int, tuple[str, ...]]:
+        return self._orders
+
+
+class ParsePlan:
+    '''
+    Immutable parse plan compiled from a node tree. Changes made to the tree after compilation are not reflected, a frozen cli compiles a new plan then (see Cli.freeze)
+    '''
+
+    __slots__ = ('_root', '_plans')
+
+    def __init__(self, root: Node):
+        self._plans: dict[int, NodePlan] = {}
+        self._root = self._compile(root)
+
+    def _compile(self, node: Node) -> NodePlan:
+        if id(node) in self._plans:
+            return self._plans[id(node)]
+        plan = NodePlan(node)
+        self._plans[id(node)] = plan
+        visible_nodes: dict[str, NodePlan] = {}
+        for child in node.get_visible_nodes():
+            child_plan = self._compile(child)
+            for name in child.get_all_names():
+                visible_nodes.setdefault(name, child_plan)
+        visible_nodes |= {child.name: self._plans[id(child)] for child in node.get_visible_nodes()}  # main names take precedence
+        hidden_nodes = tuple(map(self._compile, node.get_hidden_nodes()))
+        plan._link(visible_nodes, hidden_nodes)
+        return plan
+
+    @property
+    def root(self) -> NodePlan:
+        return self._root
+
+    def get_plan(self, node: Node) -> NodePlan:
+        return self._plans[id(node)]
+
+    def get_ambiguities(self) -> dict[str, Mapping[int, tuple[str, ...]]]:
+        '''
+        :return: The ambiguities of the hidden nodes found while compiling (see HiddenNodeTable.get_ambiguities), by the names of their parents
+        '''
+        tables = ((plan.node.name, plan.get_hidden_table()) for plan in self._plans.values())
+        return {name: table.get_ambiguities() for name, table in tables if table is not None and table.get_ambiguities()}
+
+    def __len__(self):
+        return len(self._plans)
@@ -1,46 +1,46 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from array import array
+from collections import deque
+from collections.abc import Iterable, Sequence
 from itertools import islice
 
 
-class SmartList(list):
+class LimitedMixin:
+    '''
+    Skips the Nones and cuts the values over the limit when adding
+    '''
 
-    def __init__(self, *to_list, limit: int = None, **kwargs):
-        super().__init__(**kwargs)
-        self._limit = limit
-        if to_list:
-            self.extend(to_list)
+    __slots__ = ()
 
-    def __iadd__(self, elems) -> SmartList:
-        elems = [elems] if not isinstance(elems, Iterable) or isinstance(elems, str) else elems
-        elems = self._remove_nones(elems)
-        elems = self._cut_over_limit(elems)
-        super().extend(list(elems))
+    def __iadd__(self, elems):
+        self._add(elems)
         return self
 
+    def _add(self, elems) -> list:
+        '''
+        :return: The values that did not fit into the limit
+        '''
+        elems = [elems] if not isinstance(elems, Iterable) or isinstance(elems, str) else elems
+        if not isinstance(elems, array):  # arrays have no Nones
+            elems = list(self._remove_nones(elems))
+        free = max(self._get_free_space(), 0) if self._is_limited() else len(elems)
+        super().extend(elems[:free])
+        return elems[free:]
+
     def filter_out(self, elems) -> list:
-        self.__iadd__(elems)
-        return list(filter(lambda e: e not in list(self), elems))
+        '''
+        Adds the values that fit into the limit
+        :return: The rest of the values
+        '''
+        return self._add(elems)
 
     def get_limit(self):
         return self._limit
 
-    def set_limit(self, limit: int | None):
-        self._limit = limit
-        if limit is not None and len(self) >= limit:
-            self[:] = self[:limit]
-
     def _remove_nones(self, to_filter: Iterable):
         return (elem for elem in to_filter if elem is not None)
 
-    def _cut_over_limit(self, to_cut: Iterable):
-        return islice(to_cut, self._get_free_space()) if self._is_limited() else to_cut
-
-    def __add__(self, x) -> SmartList:
-        self.extend(x)
-        return self
-
     def append(self, __object) -> None:
         self.__iadd__(__object)
 
@@ -53,8 +53,200 @@ class SmartList(list):
     def _get_free_space(self):
         return self._limit - len(self)
 
+
+class SmartList(LimitedMixin, list):
+    __slots__ = ('_limit',)
+
+    def __init__(self, *to_list, limit: int = None, **kwargs):
+        super().__init__(**kwargs)
+        self._limit = limit
+        if to_list:
+            self.extend(to_list)
+
+    def set_limit(self, limit: int | None):
+        self._limit = limit
+        if limit is not None and len(self) >= limit:
+            self[:] = self[:limit]
+
+    def __add__(self, x) -> SmartList:
+        self.extend(x)
+        return self
+
     def __neg__(self):
         to_return = self[0] if len(self) else None
         if to_return:
-            self.remove(to_return)
+            del self[0]
         return to_return
+
+
+class SmartDeque(LimitedMixin, deque):
+    '''
+    SmartList kept in a deque, so taking the first value (see __neg__) is O(1). Meant for the collections consumed from the front
+    '''
+
+    __slots__ = ('_limit',)
+
+    def __init__(self, *to_list, limit: int = None):
+        super().__init__()
+        self._limit = limit
+        if to_list:
+            self.extend(to_list)
+
+    def set_limit(self, limit: int | None):
+        self._limit = limit
+        while limit is not None and len(self) > limit:
+            self.pop()
+
+    def __neg__(self):
+        to_return = self[0] if len(self) else None
+        if to_return:
+            self.popleft()
+        return to_return
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self)[i]
+        return super().__getitem__(i)
+
+    def copy(self) -> list:
+        return list(self)
+
+    def sort(self, **kwargs) -> None:
+        values = sorted(self, **kwargs)
+        self.clear()
+        super().extend(values)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, deque)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __reduce__(self):
+        return self.__class__, (), (None, {'_limit': self._limit}), iter(self)
+
+
+class SmartArray(LimitedMixin, array):
+    '''
+    SmartList kept in a typed array (see the array module), so every numeric value takes a few bytes
+    '''
+
+    __slots__ = ('_limit',)
+
+    def __new__(cls, typecode: str, *to_list, limit: int = None):
+        return super().__new__(cls, typecode)
+
+    def __init__(self, typecode: str, *to_list, limit: int = None):
+        self._limit = limit
+        if to_list:
+            self.extend(to_list)
+
+    def _add(self, elems) -> list:
+        if isinstance(elems, array) and elems.typecode != self.typecode:
+            elems = elems.tolist()
+        return super()._add(elems)
+
+    def set_limit(self, limit: int | None):
+        self._limit = limit
+        if limit is not None:
+            del self[limit:]
+
+    def __neg__(self):
+        to_return = self[0] if len(self) else None
+        if to_return:
+            del self[0]
+        return to_return
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.tolist()[i]
+        return super().__getitem__(i)
+
+    def clear(self) -> None:
+        del self[:]
+
+    def copy(self) -> list:
+        return self.tolist()
+
+    def sort(self, **kwargs) -> None:
+        values = sorted(self, **kwargs)
+        del self[:]
+        super().extend(values)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, array)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def __reduce_ex__(self, protocol):
+        return self.__class__, (self.typecode,), (None, {'_limit': self._limit}), iter(self)
+
+
+class ValuesView(Sequence):
+    '''
+    Read-only view of the first values of a sequence, up to the stop. Nothing is copied and the stop is applied on reading,
+    so the view follows the changes of the sequence
+    '''
+
+    __slots__ = ('_values', '_stop')
+
+    def __init__(self, values: Sequence, stop: int = None):
+        self._values = values
+        self._stop = stop
+
+    def limit(self, stop: int | None) -> ValuesView:
+        if stop is None:
+            return self
+        return ValuesView(self._values, stop if self._stop is None else min(stop, self._stop))
+
+    def _is_cut(self) -> bool:
+        return self._stop is not None and self._stop < len(self._values)
+
+    def __len__(self):
+        return min(len(self._values), self._stop) if self._is_cut() else len(self._values)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            return list(islice(self._values, start, stop, step)) if step > 0 else self.to_list()[i]
+        size = len(self)
+        if not -size <= i < size:
+            raise IndexError('view index out of range')
+        return self._values[i if i >= 0 else i + size]
+
+    def __iter__(self):
+        return islice(self._values, self._stop) if self._is_cut() else iter(self._values)
+
+    def __contains__(self, item):
+        if self._is_cut():
+            return any(value is item or value == item for value in self)
+        return item in self._values
+
+    def to_list(self) -> list:
+        return list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, ValuesView):
+            other = other.to_list()
+        if isinstance(other, list):
+            return len(self) == len(other) and all(value == other_value for value, other_value in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_list())
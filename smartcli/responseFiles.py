@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import mmap
+import os
+from typing import Iterator, Sequence
+
+from .exceptions import ParsingException
+from .tokenizer import iter_args
+
+
+class ResponseFiles:
+    '''
+    Expands the @path arguments into the arguments written in the files (response files), for argument lists too long for the command line.
+    A file is memory mapped and its tokens are read one by one, so it is never copied whole into a string or a list of lines.
+    The tokens are split like a command line (see tokenizer.split_args): they are separated by whitespaces and built of adjacent parts, quoted with " or ' or escaped with \\.
+    Response files can refer to other response files up to the max depth, the files of a single expansion can take up to max size bytes
+    '''
+
+    def __init__(self, prefix: str = '@', max_size: int = 64 * 2 ** 20, max_depth: int = 8, encoding: str = 'utf-8'):
+        self._prefix = prefix
+        self._max_size = max_size
+        self._max_depth = max_depth
+        self._encoding = encoding
+
+    def is_response_file(self, arg: str) -> bool:
+        return len(arg) > len(self._prefix) and arg.startswith(self._prefix)
+
+    def expand(self, args: Sequence[str]) -> list[str]:
+        '''
+        :return: The arguments with the response files expanded, the first argument (the program name) is never expanded
+        '''
+        if not any(map(self.is_response_file, args[1:])):
+            return list(args)
+        expanded = list(args[:1])
+        expanded.extend(self._expand_all(args[1:], [], [0]))
+        return expanded
+
+    __call__ = expand
+
+    def _expand_all(self, args: Iterator[str] | Sequence[str], opened: list[str], size: list[int]) -> Iterator[str]:
+        for arg in args:
+            if self.is_response_file(arg):
+                yield from self._read(arg[len(self._prefix):], opened, size)
+            else:
+                yield arg
+
+    def _read(self, path: str, opened: list[str], size: list[int]) -> Iterator[str]:
+        real_path = os.path.realpath(path)
+        if real_path in opened:
+            raise ParsingException([f'Response file {path} includes itself'])
+        if len(opened) >= self._max_depth:
+            raise ParsingException([f'Response file {path} is nested deeper than {self._max_depth}'])
+        try:
+            file_size = os.path.getsize(real_path)
+        except OSError as e:
+            raise ParsingException([f'Cannot read the response file {path}']) from e
+        size[0] += file_size
+        if size[0] > self._max_size:
+            raise ParsingException([f'Response files exceed {self._max_size} bytes'])
+        if not file_size:
+            return
+
+        opened.append(real_path)
+        with open(real_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            tokens = self._tokenize(mapped, path)
+            try:
+                yield from self._expand_all(tokens, opened, size)
+            finally:
+                tokens.close()  # releases the buffer of the map before it is closed
+        opened.pop()
+
+    def _tokenize(self, mapped: mmap.mmap, path: str) -> Iterator[str]:
+        try:
+            for token in iter_args(mapped):
+                yield token.decode(self._encoding)
+        except UnicodeDecodeError as e:
+            raise ParsingException([f'Response file {path} is not valid {self._encoding}']) from e
+        except ValueError as e:
+            raise ParsingException([f'Response file {path}: {e}']) from e
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import re
+from enum import IntEnum
+from typing import Iterator, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .nodes.cli_elements import Node
+    from .nodes.parsePlan import NodePlan
+
+
+_part_regex = r'''(?P<space>[ \t\r\n]+)|(?P<plain>[^ \t\r\n'"\\]+)|\\(?P<escaped>.)|'(?P<single>[^']*)'|"(?P<double>(?:[^"\\]|\\.)*)"|(?P<error>.)'''
+_part_pattern = re.compile(_part_regex, re.DOTALL)
+_byte_part_pattern = re.compile(_part_regex.encode(), re.DOTALL)
+_plain_pattern = re.compile(r'[^ \t\r\n]+')
+_double_quoted_escape_pattern = re.compile(r'\\(["\\])')
+_byte_double_quoted_escape_pattern = re.compile(rb'\\(["\\])')
+
+
+def split_args(line: str) -> list[str]:
+    '''
+    Splits the line into arguments like shlex.split (POSIX mode, without comments), with compiled regular expressions instead of a state machine run for every character
+    '''
+    if '"' not in line and "'" not in line and '\\' not in line:
+        return _plain_pattern.findall(line)
+    return list(iter_args(line))
+
+
+def iter_args(line: str | bytes) -> Iterator[str] | Iterator[bytes]:
+    '''
+    Yields the arguments of the line one by one (see split_args). The arguments of a bytes-like line, like a memory mapped file, are bytes
+    '''
+    text_line = isinstance(line, str)
+    part_pattern, escape_pattern = (_part_pattern, _double_quoted_escape_pattern) if text_line else (_byte_part_pattern, _byte_double_quoted_escape_pattern)
+    empty, backslash, unescaped = ('', '\\', r'\1') if text_line else (b'', b'\\', rb'\1')
+
+    parts, in_arg = [], False
+    for match in part_pattern.finditer(line):
+        kind = match.lastgroup
+        if kind == 'space':
+            if in_arg:
+                yield empty.join(parts)
+                parts, in_arg = [], False
+            continue
+        if kind == 'error':
+            raise ValueError(_get_error_message(line[match.start():]))
+        text = match.group(kind)
+        parts.append(escape_pattern.sub(unescaped, text) if kind == 'double' and backslash in text else text)
+        in_arg = True
+    if in_arg:
+        yield empty.join(parts)
+
+
+def _get_error_message(rest: str | bytes) -> str:
+    '''
+    :return: The message of shlex for the unsplittable rest of the line: a backslash at the end, also inside double quotes, or a quote not closed
+    '''
+    backslash = '\\' if isinstance(rest, str) else b'\\'
+    if rest[:1] not in ("'", b"'") and (len(rest) - len(rest.rstrip(backslash))) % 2 == 1:
+        return 'No escaped character'
+    return 'No closing quotation'
+
+
+class TokenKind(IntEnum):
+    POSITIONAL = 0
+    NODE = 1
+    FLAG = 2
+    FLAG_VALUE = 3
+
+
+class Tokenizer:
+    '''
+    Classifies the tokens of the arguments in place. Every token has a single byte kind and the phases of parsing
+    read index spans of a kind instead of copying the arguments
+    '''
+
+    _span_patterns = {kind: re.compile(re.escape(bytes((kind,))) + b'+') for kind in TokenKind}
+
+    def __init__(self, args: Sequence[str]):
+        self._args = args
+        self._kinds = bytearray(len(args))
+        if args:
+            self._kinds[0] = TokenKind.NODE  # program name
+
+    @property
+    def args(self) -> Sequence[str]:
+        return self._args
+
+    def __len__(self):
+        return len(self._args)
+
+    def get_kind(self, i: int) -> TokenKind:
+        return TokenKind(self._kinds[i])
+
+    def count(self, kind: TokenKind) -> int:
+        return self._kinds.count(kind)
+
+    def get_spans(self, kind: TokenKind) -> Iterator[tuple[int, int]]:
+        return (match.span() for match in self._span_patterns[kind].finditer(self._kinds))
+
+    def get_indexes(self, kind: TokenKind) -> Iterator[int]:
+        return (i for start, stop in self.get_spans(kind) for i in range(start, stop))
+
+    def get_args(self, kind: TokenKind) -> list[str]:
+        return self._get_args_of(list(self.get_spans(kind)))
+
+    def _get_args_of(self, spans: list[tuple[int, int]]) -> list[str]:
+        if len(spans) == 1:
+            return self._args[spans[0][0]:spans[0][1]]
+        args = []
+        for start, stop in spans:
+            args += self._args[start:stop]
+        return args
+
+    def mark(self, i: int, kind: TokenKind) -> None:
+        self._kinds[i] = kind
+
+    def _mark_prefix(self, spans: list[tuple[int, int]], count: int, kind: TokenKind) -> None:
+        for start, stop in spans:
+            if count <= 0:
+                break
+            stop = min(stop, start + count)
+            self._kinds[start:stop] = bytes((kind,)) * (stop - start)
+            count -= stop - start
+
+    def classify_flags(self, scope: Node | NodePlan, activate=True) -> None:
+        '''
+        Marks flags of the scope and their values among the positional tokens. Flags get activated and the values are added to them.
+        Values the flag does not take stay positional
+        '''
+        flag_at, value_spans = None, []
+        met_node = None
+        for start, stop in list(self.get_spans(TokenKind.POSITIONAL)):
+            run_start = start
+            for i in range(start, stop):
+                arg = self._args[i]
+                if scope.has_flag(arg) and not (met_node and met_node.has_flag(arg)):
+                    if flag_at is not None:
+                        value_spans.append((run_start, i))
+                        self._apply_flag(scope, flag_at, value_spans, activate)
+                    flag_at, value_spans, run_start = i, [], i + 1
+                elif scope.has_visible_node(arg):
+                    met_node = scope.get_visible_node(arg)
+            if flag_at is not None:
+                value_spans.append((run_start, stop))
+        if flag_at is not None:
+            self._apply_flag(scope, flag_at, value_spans, activate)
+
+    def _apply_flag(self, scope: Node | NodePlan, flag_at: int, value_spans: list[tuple[int, int]], activate: bool) -> None:
+        self.mark(flag_at, TokenKind.FLAG)
+        flag = scope.get_flag(self._args[flag_at])
+        if activate:
+            flag.activate()
+        values = self._get_args_of([span for span in value_spans if span[0] < span[1]])
+        accepted = len(values) - len(flag.add_to_values(values))
+        self._mark_prefix(value_spans, accepted, TokenKind.FLAG_VALUE)
@@ -2,10 +2,20 @@ import unittest
 
 from tests.abstractTest import AbstractTest
 from tests.categorierTest import CategorierTest
+from tests.conditionsTest import ConditionsTest
+from tests.daemonTest import DaemonTest
+from tests.importTest import ImportTest
 from tests.finalNodeTest import FinalNodeTest
 from tests.glosbeTranslatorTest import GlosbeTranslatorTest
 from tests.nodeTest import NodeTest
+from tests.parseAsyncTest import ParseAsyncTest
+from tests.parseContextTest import ParseContextTest
+from tests.parseManyTest import ParseManyTest
+from tests.parsePlanTest import ParsePlanTest
+from tests.parsingResultTest import ParsingResultTest
+from tests.responseFilesTest import ResponseFilesTest
 from tests.selectingParametersMethodsTest import SelectingParametersMethodsTest
+from tests.tokenizerTest import TokenizerTest
 
 tests = [
     GlosbeTranslatorTest,
@@ -13,6 +23,16 @@ tests = [
     SelectingParametersMethodsTest,
     FinalNodeTest,
     NodeTest,
+    ParsePlanTest,
+    ParseManyTest,
+    TokenizerTest,
+    ParseContextTest,
+    ParseAsyncTest,
+    ParsingResultTest,
+    ConditionsTest,
+    ResponseFilesTest,
+    DaemonTest,
+    ImportTest,
 ]
 
 
@@ -0,0 +1,103 @@
+from parameterized import parameterized
+
+from smartcli import Cli, CliCollection, Root
+from smartcli.nodes.conditions import FlagActive, FlagsActive, FlagsInCollection, InCollection, NotEmpty, Not, All, Any
+from tests.abstractTest import AbstractTest
+
+
+class ConditionsTest(AbstractTest):
+
+    def create_root(self) -> Root:
+        self.root = Root()
+        self.flag = self.root.add_flag('--flag', '-f')
+        self.other = self.root.add_flag('--other', '-o')
+        self.coll = self.root.add_collection('coll')
+        return self.root
+
+    @parameterized.expand([
+        ('flag_active', lambda t: FlagActive(t.flag), [True, False]),
+        ('in_collection', lambda t: InCollection(t.coll, 'a'), [True, False]),
+        ('not_empty', lambda t: NotEmpty(t.coll), [True, False]),
+        ('not', lambda t: Not(NotEmpty(t.coll)), [False, True]),
+        ('all', lambda t: All(FlagActive(t.flag), NotEmpty(t.coll)), [True, False]),
+        ('any', lambda t: Any(FlagActive(t.other), Not(NotEmpty(t.coll))), [False, True]),
+        ('operators', lambda t: FlagActive(t.flag) & ~FlagActive(t.other) | NotEmpty(t.coll), [True, False]),
+        ('flags_any', lambda t: FlagsActive(t.flag, t.other), [True, False]),
+        ('flags_all', lambda t: FlagsActive(t.flag, t.other, func=all), [False, False]),
+        ('flags_in_collection', lambda t: FlagsInCollection(t.coll, t.flag, func=any), [False, False]),
+    ])
+    def test_evaluation(self, name, create_condition, expected):
+        self.create_root()
+        condition = create_condition(self)
+
+        self.flag.activate()
+        self.coll += 'a'
+        met = condition()
+        self.flag.deactivate()
+        self.coll.clear()
+        not_met = condition()
+
+        self.assertEqual(expected, [met, not_met])
+
+    def test_inputs(self):
+        self.create_root()
+
+        self.assertEqual((self.flag, self.coll), All(FlagActive(self.flag), Not(InCollection(self.coll, 'a'))).get_inputs())
+        self.assertIsNone(Any(FlagActive(self.flag), lambda: True).get_inputs())
+
+    def test_builders_declare_inputs(self):
+        root = self.create_root()
+        hidden = root.add_hidden_node('hidden')
+        hidden.set_active_on_flags(self.flag)
+        hidden.set_inactive_on_empty(self.coll)
+        opaque = root.add_hidden_node('opaque', active_condition=lambda: True)
+
+        self.assertEqual((hidden, self.flag, self.coll), hidden.get_condition_inputs())
+        self.assertIsNone(opaque.get_condition_inputs())
+
+    def test_evaluated_again_only_after_inputs_change(self):
+        cli = Cli(root=self.create_root())
+        calls = []
+        hidden = self.root.add_hidden_node('hidden', active_condition=FlagActive(self.flag))
+        counted = self.root.add_hidden_node('counted')
+        counted.set_active_on_conditions(All(FlagActive(hidden), NotEmpty(self.coll)))
+        counted.set_active_on_conditions(All(FlagActive(self.flag)))
+        evaluate = counted._evaluate_conditions
+        counted._evaluate_conditions = lambda: calls.append(1) or evaluate()
+
+        def query():
+            counted.is_active()
+            self.other.activate()
+            counted.is_active()
+            self.coll += 'a'
+            return counted.is_active()
+        hidden.add_action(query)
+
+        active = cli.parse('prog -f').result
+
+        self.assertTrue(active)
+        self.assertEqual(2, len(calls))  # when selecting the hidden node, then only after the collection changed
+
+    def test_flags_in_collection(self):
+        self.create_root()
+        any_in, all_in = FlagsInCollection(self.coll, self.flag, self.other, func=any), FlagsInCollection(self.coll, self.flag, self.other)
+
+        self.coll += self.flag
+        self.assertEqual(self.flag.get_mask(), self.coll.get_flag_bits())
+        self.assertEqual([True, False], [any_in(), all_in()])
+        self.coll += self.other
+        self.assertEqual([True, True], [any_in(), all_in()])
+        self.coll += 'a'
+        self.assertIsNone(self.coll.get_flag_bits())
+        self.assertEqual([True, True], [any_in(), all_in()])
+
+    def test_builders_use_bitwise_conditions(self):
+        root = self.create_root()
+        hidden = root.add_hidden_node('hidden')
+        hidden.set_active_on_flags(self.flag, self.other, func=all)
+
+        self.flag.activate()
+        self.assertFalse(hidden.is_active())
+        self.other.activate()
+        self.assertTrue(hidden.is_active())
+        self.assertIsInstance(hidden._active_conditions[0], FlagsActive)
@@ -0,0 +1,104 @@
+import asyncio
+import io
+import os
+import stat
+import tempfile
+import threading
+
+from smartcli import Cli
+from smartcli.daemon import CliDaemon
+from smartcli.daemonClient import run_client
+from tests.abstractTest import AbstractTest
+
+
+class DaemonTest(AbstractTest):
+
+    def create_cli(self) -> Cli:
+        self.cli = Cli()
+        root = self.cli.root
+        loud = root.add_flag('--loud', '-l')
+        greet = root.add_node('greet')
+        greet.set_possible_param_order('name')
+        greet.add_action(lambda name: print(f'HELLO {name.upper()}' if loud.is_active() else f'hello {name}'))
+        root.add_node('where').add_action(lambda: print(os.getcwd(), os.environ.get('GREETING')))
+        root.add_node('fail').add_action(lambda: 1 / 0)
+        self.meeting = threading.Barrier(2, timeout=5)
+        root.add_node('meet').add_action(self.meet)
+        return self.cli
+
+    def meet(self):
+        self.meeting.wait()  # breaks unless the other parse runs at the same time
+        print('met')
+
+    def run_clients(self, *argvs: list[str], **request) -> list[tuple[int, str, str]]:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        daemon = CliDaemon(self.create_cli(), os.path.join(directory.name, 'cli.sock'))
+
+        def run(argv):
+            out, err = io.StringIO(), io.StringIO()
+            code = run_client(daemon.path, argv, out, err, **request)
+            return code, out.getvalue(), err.getvalue()
+
+        async def serve_clients():
+            await daemon.start()
+            try:
+                loop = asyncio.get_running_loop()
+                return await asyncio.gather(*(loop.run_in_executor(None, run, argv) for argv in argvs))
+            finally:
+                await daemon.close()
+
+        return asyncio.run(serve_clients())
+
+    def test_concurrent_clients_have_own_parse_state(self):
+        results = self.run_clients(*(['prog', 'greet', f'n{i}'] + (['-l'] if i % 2 else []) for i in range(10)))
+
+        self.assertEqual([(0, f'HELLO N{i}\n' if i % 2 else f'hello n{i}\n', '') for i in range(10)], results)
+
+    def test_parses_overlap(self):
+        results = self.run_clients(['prog', 'meet'], ['prog', 'meet'])
+
+        self.assertEqual([(0, 'met\n', '')] * 2, results)
+
+    def test_cwd_and_environment_forwarded(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cwd = os.path.realpath(directory.name)
+
+        (code, out, err), = self.run_clients(['prog', 'where'], cwd=cwd, env={'GREETING': 'hi'})
+
+        self.assertEqual((0, f'{cwd} hi\n'), (code, out))
+        self.assertNotEqual(cwd, os.getcwd())
+        self.assertNotIn('GREETING', os.environ)
+
+    def test_environment_restored_when_switch_fails(self):
+        environment = dict(os.environ)
+
+        (code, out, err), = self.run_clients(['prog', 'where'], env={'GREETING': 'hi', 'BROKEN': 'null\0byte'})
+
+        self.assertEqual(1, code)
+        self.assertIn('ValueError', err)
+        self.assertEqual(environment, dict(os.environ))
+
+    def test_socket_accessible_only_to_user(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        daemon = CliDaemon(self.create_cli(), os.path.join(directory.name, 'cli.sock'))
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+
+        async def get_mode():
+            await daemon.start()
+            try:
+                return stat.S_IMODE(os.stat(daemon.path).st_mode)
+            finally:
+                await daemon.close()
+
+        self.assertEqual(0o600, asyncio.run(get_mode()))
+        self.assertEqual(0o022, os.umask(0o022))
+
+    def test_errors_reported(self):
+        (code, out, err), = self.run_clients(['prog', 'fail'])
+
+        self.assertEqual(1, code)
+        self.assertIn('ZeroDivisionError', err)
@@ -1,8 +1,14 @@
+from decimal import Decimal
+from importlib.util import find_spec
+from unittest import skipUnless
+
 from parameterized import parameterized
 
-from smartcli import Flag
+from smartcli import Cli, Flag
 from smartcli.exceptions import IncorrectArity
 from smartcli.nodes.cli_elements import FinalNode, Parameter, CliCollection
+from smartcli.nodes.converters import get_bulk_converter, register_bulk_converter, unregister_bulk_converter
+from smartcli.nodes.smartList import SmartArray, SmartList
 from tests.abstractTest import AbstractTest
 
 
@@ -100,3 +106,124 @@ class FinalNodeTest(AbstractTest):
     def test_default_value_in_flag(self, name: str, to_check: Flag | str):
         storage = CliCollection(default='-m')
         self.assertTrue(to_check in storage)
+
+    @parameterized.expand([
+        ('string', ['a', 'b'], 'b', True),
+        ('missing_string', ['a', 'b'], 'c', False),
+        ('flag_by_name', ['-m'], Flag('main', '-m'), True),
+        ('flag_by_alias_of_flag', [Flag('--mode', '-m')], Flag('main', '-m'), True),
+        ('missing_flag', [Flag('--mode', '-o')], Flag('main', '-m'), False),
+        ('unhashable', [['a'], 'b'], ['a'], True),
+        ('number', [1, 2], 2, True),
+    ])
+    def test_membership(self, name, values, item, expected):
+        storage = CliCollection()
+        storage += values
+
+        self.assertEqual(expected, item in storage)
+
+    def test_membership_follows_changes(self):
+        storage = CliCollection()
+        flag = Flag('main', '-m')
+
+        storage += ['a', 'b']
+        self.assertIn('b', storage)
+        storage.set_limit(1)
+        self.assertNotIn('b', storage)
+        storage.set_limit(None)
+        storage.append(flag)
+        flag.add_alternative_names('-n')
+        self.assertIn(Flag('other', '-n'), storage)
+        storage.clear()
+        self.assertNotIn(flag, storage)
+
+    @parameterized.expand([
+        ('list', False),
+        ('queue', True),
+    ])
+    def test_overflow_and_taking_first(self, name, queue):
+        storage = CliCollection(3, queue=queue)
+
+        rest = storage.filter_out(['a', None, 'b', 'a', 'c', 'd'])
+        first = -storage
+
+        self.assertEqual(['c', 'd'], rest)
+        self.assertEqual('a', first)
+        self.assertEqual(['b', 'a'], storage)
+        self.assertEqual(['b'], storage[:1])
+
+    def test_view_follows_values_without_copying(self):
+        param = Parameter('test', storage_limit=None, parameter_limit=2)
+        param.add_to_values(['a'])
+        view = param.get_view()
+
+        param.get_storage().append('b')
+        param.get_storage().append('c')
+
+        self.assertEqual(['a', 'b'], view)
+        self.assertEqual(['a', 'b', 'c'], param.get_storage().get_view())
+        self.assertEqual(('b', 'b', ['b']), (view[1], view[-1], view[1:]))
+        self.assertNotIn('c', view)
+        with self.assertRaises(IndexError):
+            view[2]
+
+    def test_view_of_defaults(self):
+        storage = CliCollection(default=['x', 'y'])
+
+        self.assertEqual(['x', 'y'], storage.get_view())
+        self.assertEqual(['x', 'y'], storage.get_as_list())
+        storage.append('z')
+        self.assertEqual('z', storage.get())
+
+    @parameterized.expand([
+        ('list', False, list),
+        ('compact', True, SmartArray),
+    ])
+    def test_bulk_conversion(self, name, compact, values_type):
+        param = Parameter('ids', storage=CliCollection(compact=compact, type=int), parameter_limit=None)
+
+        rest = param.add_to_values(['1', '', '2', '-3'])
+
+        self.assertEqual([], rest)
+        self.assertEqual([1, 2, -3], param.get_plain())
+        self.assertIsInstance(param.get_storage()._values(), values_type)
+
+    def test_compact_values_kept_in_list_when_too_big_for_array(self):
+        param = Parameter('ids', storage=CliCollection(compact=True, type=int), parameter_limit=None)
+
+        param.add_to_values(['1'])
+        rest = param.add_to_values(['99999999999999999999999', '2'])
+
+        self.assertEqual([], rest)
+        self.assertEqual([1, 99999999999999999999999, 2], param.get_plain())
+        self.assertIsInstance(param.get_storage()._values(), SmartList)
+
+    def test_parse_compact_values_too_big_for_array(self):
+        cli = Cli()
+        cli.root.add_param(Parameter('ids', storage=CliCollection(compact=True, type=int), parameter_limit=None))
+        cli.root.set_possible_param_order('ids')
+
+        cli.parse('prog 1 99999999999999999999999')
+
+        self.assertEqual([1, 99999999999999999999999], cli.root.get_param('ids').get_plain())
+
+    @skipUnless(find_spec('numpy'), 'NumPy is not installed')
+    def test_numpy_converter_registered_on_lookup(self):
+        import numpy
+
+        converter = get_bulk_converter(numpy.int32)
+
+        self.assertEqual('i', converter.typecode)
+        self.assertEqual([1, -2], converter.convert(['1', '-2']).tolist())
+
+    def test_registered_bulk_converter(self):
+        chunks = []
+        register_bulk_converter(Decimal, lambda values: chunks.append(list(values)) or [Decimal(value) for value in values])
+        self.addCleanup(unregister_bulk_converter, Decimal)
+        param = Parameter('amounts', storage_limit=None, parameter_limit=None)
+        param.set_type(Decimal)
+
+        param.add_to_values(['1.5', '2'])
+
+        self.assertEqual([['1.5', '2']], chunks)
+        self.assertEqual([Decimal('1.5'), Decimal(2)], param.get_plain())
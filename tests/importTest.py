@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+from parameterized import parameterized
+
+from tests.abstractTest import AbstractTest
+
+
+class ImportTest(AbstractTest):
+
+    deferred_modules = ('asyncio', 'multiprocessing', 'inspect', 'dataclasses', 'shlex', 'mmap', 'more_itertools', 'numpy',
+                        'smartcli.daemon', 'smartcli.nodes.helpManager', 'smartcli.responseFiles')
+
+    def run_python(self, code: str) -> dict:
+        env = dict(os.environ)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, (root, env.get('PYTHONPATH'))))
+        output = subprocess.run([sys.executable, '-c', code], env=env, cwd=root, capture_output=True, text=True, check=True).stdout
+        return json.loads(output)
+
+    def get_loaded(self, code: str) -> list[str]:
+        return self.run_python(f'import json, sys\n{code}\nprint(json.dumps([m for m in {self.deferred_modules!r} if m in sys.modules]))')
+
+    def test_import_loads_only_needed_modules(self):
+        loaded = self.get_loaded('import smartcli\nfrom smartcli import Cli\nCli()')
+
+        self.assertEqual([], loaded)
+
+    def test_parse_loads_only_needed_modules(self):
+        loaded = self.get_loaded('from smartcli import Cli\ncli = Cli()\ncli.root.add_flag("--all")\ncli.parse_without_actions(["prog", "--all"])')
+
+        self.assertEqual([], loaded)
+
+    def test_converter_lookup_does_not_import_numpy(self):
+        loaded = self.get_loaded('from smartcli.nodes.converters import get_bulk_converter\nget_bulk_converter(int)\nget_bulk_converter(str)')
+
+        self.assertNotIn('numpy', loaded)
+
+    @parameterized.expand([
+        ('help', 'cli.root.help_manager.create_help_string()', ['smartcli.nodes.helpManager', 'more_itertools']),
+        ('actions', 'cli.root.add_action(lambda: None)\ncli.parse(["prog"])', ['inspect']),
+        ('response_files', 'cli.enable_response_files()', ['smartcli.responseFiles', 'mmap']),
+    ])
+    def test_modules_loaded_on_use(self, name, code, expected):
+        loaded = self.get_loaded(f'from smartcli import Cli\ncli = Cli()\n{code}')
+
+        self.assertLessEqual(set(expected), set(loaded))
@@ -25,6 +25,22 @@ class NodeTest(AbstractTest):
 
         self.assertEqual('lollol', node.get_result())
 
+    @parameterized.expand([
+        ('positional', lambda a, b: f'{a} {b}', 'x y'),
+        ('fewer_positional', lambda a: a, 'x'),
+        ('keyword_only', lambda *, b: b, 'y'),
+        ('positional_and_keyword_only', lambda a, *, c: f'{a} {c}', 'x z'),
+        ('missing_keyword_with_default', lambda a, *, d='none': f'{a} {d}', 'x none'),
+    ])
+    def test_action_binding(self, name, action, expected):
+        node = Node('test', parameters=['a', 'b', 'c'])
+        node.add_action(action)
+
+        node.parse_node_args(['x', 'y', 'z'])
+        node.perform_all_actions()
+
+        self.assertEqual(expected, node.get_result())
+
     def test_action_when_storable_has_no_value(self):
         node = Node('test')
         storable = CliCollection()
@@ -88,3 +104,58 @@ class NodeTest(AbstractTest):
         root.set_only_hidden_nodes()
         cli = Cli(root)
         cli.parse_without_actions('t')
+
+    def test_flag_found_by_alternative_name_added_later(self):
+        node = Node('test')
+        flag = node.add_flag('--verbose', '-v')
+        flag.add_alternative_names('--loud')
+
+        self.assertIs(flag, node.get_flag('--loud'))
+        self.assertIs(flag, node.get_flag('-v'))
+        self.assertTrue(node.has_flag('--loud'))
+        self.assertEqual([flag], node.get_flags('-v', '--loud'))
+
+    @parameterized.expand([
+        ('main_name', lambda node: node.add_flag('-v')),
+        ('alternative_name_on_addition', lambda node: node.add_flag('--quiet', '-v')),
+        ('alternative_name_added_later', lambda node: node.add_flag('--quiet').add_alternative_names('-v')),
+    ])
+    def test_flag_alias_collision(self, name, add_colliding):
+        node = Node('test')
+        node.add_flag('--verbose', '-v')
+        with self.assertRaises(ValueAlreadyExistsError):
+            add_colliding(node)
+
+    def test_visible_node_found_by_alternative_name(self):
+        node = Node('test')
+        child = node.add_node('remove', 'rm')
+        child.add_alternative_names('del')
+
+        self.assertIs(child, node.get_visible_node('rm'))
+        self.assertIs(child, node.get_visible_node('del'))
+        self.assertTrue(node.has_visible_node('del'))
+        self.assertFalse(node.has_visible_node('delete'))
+
+    def test_visible_node_alias_collision(self):
+        node = Node('test')
+        node.add_node('remove', 'rm')
+        with self.assertRaises(ValueAlreadyExistsError):
+            node.add_node('rename', 'rm')
+        with self.assertRaises(ValueAlreadyExistsError):
+            node.add_node('move').add_alternative_names('remove')
+
+    def test_empty_containers_allocated_on_first_use(self):
+        node = Node('test')
+        first, second = node.add_flag('--first'), node.add_flag('--second')
+        calls = []
+
+        self.assertIs(first._on_activation, second._on_activation)
+        self.assertIs(first.get_help(), first.help)
+        self.assertIsNot(first.get_help(), second.get_help())
+        self.assertIsNone(node._help_manager)
+        first.when_active(lambda: calls.append('first'))
+        first.activate()
+
+        self.assertEqual(['first'], calls)
+        self.assertFalse(second._on_activation)
+        self.assertIsNotNone(node.help_manager)
@@ -0,0 +1,62 @@
+import asyncio
+
+from parameterized import parameterized
+
+from smartcli import Cli
+from tests.abstractTest import AbstractTest
+
+
+class ParseAsyncTest(AbstractTest):
+
+    def create_cli(self, delays: dict[str, float] = None) -> Cli:
+        self.running = 0
+        self.max_running = 0
+        delays = delays or {}
+
+        async def translate(word: str, lang: str):
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            await asyncio.sleep(delays.get(lang, 0.01))
+            self.running -= 1
+            return f'{word}-{lang}'
+
+        self.cli = Cli()
+        trans = self.cli.root.add_node('trans')
+        trans.set_possible_param_order('word')
+        for lang in ('en', 'de', 'fr', 'pl'):
+            trans.add_action(lambda word, lang=lang: translate(word, lang))
+        trans.add_action(lambda: 'sync')
+        self.cli.root.add_node('first').add_action(lambda: translate('first', 'en'))
+        return self.cli
+
+    def test_results_keep_order_of_actions(self):
+        cli = self.create_cli({'en': 0.04, 'de': 0.01, 'fr': 0.03, 'pl': 0.02})
+
+        result = asyncio.run(cli.parse_async('prog trans word'))
+
+        self.assertEqual(['sync', 'word-pl', 'word-fr', 'word-de', 'word-en'], result.context.run(result.node.get_action_results))
+        self.assertEqual('sync', result.result)
+
+    @parameterized.expand([
+        ('unlimited', None, 4),
+        ('limited', 2, 2),
+        ('sequential', 1, 1),
+    ])
+    def test_concurrency_limit(self, name, concurrency, expected_max_running):
+        cli = self.create_cli()
+
+        asyncio.run(cli.parse_async('prog trans word', concurrency=concurrency))
+
+        self.assertEqual(expected_max_running, self.max_running)
+
+    def test_concurrent_parses(self):
+        cli = self.create_cli()
+
+        async def parse_all():
+            return await asyncio.gather(*(cli.parse_async(f'prog trans w{i}') for i in range(10)), cli.parse_async('prog first'))
+
+        *results, first = asyncio.run(parse_all())
+
+        self.assertEqual([f'w{i}-pl' for i in range(10)], [result.context.run(result.node.get_action_results)[1] for result in results])
+        self.assertEqual([f'w{i}' for i in range(10)], [result.get_word() for result in results])
+        self.assertEqual('first-en', first.result)
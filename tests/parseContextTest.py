@@ -0,0 +1,255 @@
+import gc
+import json
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from smartcli import Cli
+from smartcli.nodes.cli_elements import Flag
+from smartcli.nodes.parseContext import ParseTree
+from tests.abstractTest import AbstractTest
+
+
+class ParseContextTest(AbstractTest):
+
+    def create_cli(self) -> Cli:
+        self.cli = Cli()
+        root = self.cli.root
+        loud = root.add_flag('--loud', '-l')
+        names = root.add_collection('names')
+        greet = root.add_node('greet')
+        greet.set_possible_param_order('name')
+        name = greet.get_param('name')
+        name.set_storage(names)
+        greet.add_action(lambda: f'HELLO {name.get().upper()}' if loud.is_active() else f'hello {name.get()}')
+        return self.cli
+
+    def test_state_visible_after_parse(self):
+        cli = self.create_cli()
+        loud = cli.root.get_flag('-l')
+
+        cli.parse('prog greet ann -l')
+
+        self.assertTrue(loud.is_active())
+        self.assertEqual(['ann'], cli.root.get_collection('names'))
+
+    def test_state_of_result_kept_after_next_parse(self):
+        cli = self.create_cli()
+        loud = cli.root.get_flag('-l')
+
+        first = cli.parse('prog greet ann -l')
+        second = cli.parse('prog greet bob')
+
+        self.assertEqual('ann', first.get_name())
+        self.assertEqual('bob', second.get_name())
+        self.assertTrue(first.context.run(loud.is_active))
+        self.assertFalse(loud.is_active())
+
+    def test_reset_unbinds_context(self):
+        cli = self.create_cli()
+        cli.parse('prog greet ann -l')
+
+        cli.reset()
+
+        self.assertIsNone(cli.root.get_tree().get_bound())
+        self.assertFalse(cli.root.get_flag('-l').is_active())
+        self.assertEqual([], cli.root.get_collection('names'))
+
+    def test_list_operations_see_collection_values(self):
+        cli = self.create_cli()
+        names = cli.root.get_collection('names')
+
+        cli.parse('prog greet ann')
+        names.append('bob')
+
+        self.assertEqual(['x', 'ann', 'bob'], ['x'] + names)
+        self.assertEqual('["ann", "bob"]', json.dumps(names))
+        self.assertTrue(list.__eq__(['ann', 'bob'], names))
+
+    def test_list_operations_see_values_of_visible_context(self):
+        cli = self.create_cli()
+        names = cli.root.get_collection('names')
+        cli.parse('prog greet ann')
+
+        cli.parse('prog -l')
+        self.assertEqual('[]', json.dumps(names))
+        cli.parse('prog greet bob')
+        cli.reset()
+        self.assertEqual('[]', json.dumps(names))
+
+    def test_parse_keeps_state_of_other_cli(self):
+        first, second = self.create_cli(), self.create_cli()
+        second.root.get_collection('names').append('ann')
+        second.root.get_flag('-l').activate()
+
+        first.parse('prog greet bob -l')
+
+        self.assertEqual(['ann'], second.root.get_collection('names'))
+        self.assertTrue(second.root.get_flag('-l').is_active())
+        self.assertEqual(['bob'], first.root.get_collection('names'))
+
+    def test_nested_parse_of_other_cli_keeps_outer_context(self):
+        first, second = self.create_cli(), self.create_cli()
+        outer = first.root.add_node('outer')
+        outer.add_action(lambda: second.parse('prog greet bob').result + ' ' + str(first.root.get_flag('-l').is_active()))
+
+        result = first.parse('prog -l outer')
+
+        self.assertEqual('hello bob True', result.result)
+        self.assertEqual(['bob'], second.root.get_collection('names'))
+        self.assertTrue(first.root.get_flag('-l').is_active())
+
+    def test_nested_parse_restores_outer_context(self):
+        cli = self.create_cli()
+        inner_results = []
+        outer = cli.root.add_node('outer')
+        outer.add_action(lambda: inner_results.append(cli.parse('prog greet bob').result) or cli.root.get_flag('-l').is_active())
+
+        result = cli.parse('prog -l outer')
+
+        self.assertEqual(['hello bob'], inner_results)
+        self.assertTrue(result.result)
+
+    def test_concurrent_parses(self):
+        cli = self.create_cli()
+        inputs = [f'prog greet name{i}' + (' -l' if i % 2 else '') for i in range(200)]
+        expected = [f'HELLO NAME{i}' if i % 2 else f'hello name{i}' for i in range(200)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda line: cli.parse(line).result, inputs))
+
+        self.assertEqual(expected, results)
+
+    def test_reset_drops_detached_state(self):
+        cli = self.create_cli()
+        cli.reset()
+        loud, names = cli.root.get_flag('-l'), cli.root.get_collection('names')
+        loud.activate()
+        names += 'ann'
+
+        self.assertEqual([names], cli.root.get_tree().get_detached().get_touched())
+        cli.reset()
+
+        self.assertIsNone(cli.root.get_tree().get_detached())
+        self.assertFalse(loud.is_active())
+        self.assertEqual([], names)
+
+    def test_reset_keeps_state_of_other_cli(self):
+        first, second = self.create_cli(), self.create_cli()
+        first.root.get_collection('names').append('ann')
+        second.root.get_collection('names').append('bob')
+
+        second.reset()
+
+        self.assertEqual(['ann'], first.root.get_collection('names'))
+        self.assertEqual([], second.root.get_collection('names'))
+
+    def test_reset_keeps_parse_of_other_cli(self):
+        first, second = self.create_cli(), self.create_cli()
+        first.parse('prog greet ann -l')
+
+        second.reset()
+
+        self.assertTrue(first.root.get_flag('-l').is_active())
+        self.assertEqual(['ann'], first.root.get_collection('names'))
+
+    def test_state_of_collected_elements_is_dropped(self):
+        cli = self.create_cli()
+        cli.root.get_collection('names').append('ann')
+        cli.parse('prog greet bob')
+        root = weakref.ref(cli.root)
+
+        del cli
+        self.cli = None
+        gc.collect()
+
+        self.assertIsNone(root())
+
+    def test_condition_evaluated_once_per_parse(self):
+        cli = Cli()
+        root = cli.root
+        calls = []
+        loud = root.add_flag('--loud', '-l')
+        hidden = root.add_hidden_node('shout', active_condition=lambda: calls.append(1) or loud.is_active())
+        hidden.add_action(lambda: [hidden.is_active() for _ in range(5)] and 'shouted')
+
+        result = cli.parse('prog -l')
+
+        self.assertEqual('shouted', result.result)
+        self.assertEqual(1, len(calls))
+
+    def test_condition_cache_invalidated_by_changes(self):
+        cli = self.create_cli()
+        names = cli.root.get_collection('names')
+        loud = cli.root.get_flag('-l')
+        hidden = cli.root.add_hidden_node('named', active_condition=lambda: len(names) > 1 and loud.is_active())
+        cli.parse('prog greet ann')
+
+        self.assertFalse(hidden.is_active())
+        names += 'bob'
+        self.assertFalse(hidden.is_active())
+        loud.activate()
+        self.assertTrue(hidden.is_active())
+        names.clear()
+        self.assertFalse(hidden.is_active())
+
+    def test_condition_evaluated_again_after_arity_changes(self):
+        cli = Cli()
+        greet = cli.root.add_node('greet')
+        greet.set_possible_param_order('name')
+        single = greet.add_hidden_node('single', active_condition=lambda: cli.node_arguments_count == 1)
+        seen = []
+        cli.add_pre_parse_action_when(lambda: seen.append(single.is_active()), lambda: True)
+
+        cli.parse('prog greet ann')
+
+        self.assertEqual([True], seen)
+
+    def test_condition_not_cached_after_parse(self):
+        cli = self.create_cli()
+        state = {'on': False}
+        hidden = cli.root.add_hidden_node('switched')
+        hidden.set_active_on_conditions(lambda: state['on'])
+        cli.parse('prog')
+
+        state['on'] = True
+
+        self.assertTrue(hidden.is_active())
+
+    def test_active_flags_kept_as_bits_per_context(self):
+        cli = self.create_cli()
+        loud, quiet = cli.root.get_flag('-l'), cli.root.add_flag('--quiet', '-q')
+
+        first = cli.parse('prog greet ann -l')
+        second = cli.parse('prog greet bob -q')
+
+        self.assertNotEqual(loud.get_mask(), quiet.get_mask())
+        self.assertEqual(loud.get_mask(), first.context.active_flags)
+        self.assertEqual(quiet.get_mask(), second.context.active_flags)
+
+    def test_flag_bits_assigned_per_tree(self):
+        first, second = Cli(), Cli()
+
+        first_flags = [first.root.add_flag(f'--first{i}') for i in range(3)]
+        second_flags = [second.root.add_flag(f'--second{i}') for i in range(3)]
+
+        self.assertEqual([flag.get_bit() for flag in first_flags], [flag.get_bit() for flag in second_flags])
+
+    def test_flag_keeps_activity_when_joining_other_tree(self):
+        cli = self.create_cli()
+        flag = Flag('--verbose', '-v')
+        flag.set_activated(True)
+
+        cli.root.add_flag(flag)
+
+        self.assertTrue(flag.is_active())
+        self.assertNotIn(flag.get_bit(), [other.get_bit() for other in cli.root.get_flags() if other is not flag])
+
+    def test_concurrent_bit_assignment_gives_unique_bits(self):
+        tree = ParseTree()
+        flags = [Flag(f'--flag{i}') for i in range(200)]
+
+        with ThreadPoolExecutor(8) as pool:
+            bits = list(pool.map(tree.assign_bit, flags * 2))
+
+        self.assertEqual(list(range(200)), sorted(bits[:200]))
+        self.assertEqual(bits[:200], bits[200:])
@@ -0,0 +1,87 @@
+from smartcli import Cli
+from smartcli.exceptions import IncorrectStateError
+from tests.abstractTest import AbstractTest
+
+
+def create_greeting_cli() -> Cli:
+    cli = Cli()
+    root = cli.root
+    loud = root.add_flag('--loud', '-l')
+    names = root.add_collection('names')
+    greet = root.add_node('greet')
+    greet.set_possible_param_order('name')
+    name = greet.get_param('name')
+    name.set_storage(names)
+    greet.add_action(lambda: f'HELLO {name.get().upper()}' if loud.is_active() else f'hello {name.get()}')
+    greet.add_action_when_is_active(lambda: len(names), loud)
+    return cli
+
+
+class ParseManyTest(AbstractTest):
+
+    def create_cli(self) -> Cli:
+        self.cli = create_greeting_cli()
+        return self.cli
+
+    def test_same_results_as_parse(self):
+        inputs = ['prog greet ann -l', 'prog greet bob', 'prog -l greet cid', 'prog greet dan']
+        expected = [self.create_cli().parse(line).result for line in inputs]
+
+        results = [result.result for result in self.create_cli().parse_many(inputs)]
+
+        self.assertEqual(expected, results)
+
+    def test_state_of_previous_item_is_reset(self):
+        cli = self.create_cli()
+        names = cli.root.get_collection('names')
+        loud = cli.root.get_flag('-l')
+        results = cli.parse_many(['prog greet ann -l', 'prog greet bob'])
+
+        next(results)
+        self.assertTrue(loud.is_active())
+        next(results)
+        self.assertFalse(loud.is_active())
+        self.assertEqual(['bob'], names)
+
+    def test_lazy_consumption_of_input(self):
+        consumed = []
+
+        def inputs():
+            for line in ['prog greet ann', 'prog greet bob']:
+                consumed.append(line)
+                yield line
+
+        results = self.create_cli().parse_many(inputs())
+        self.assertEqual([], consumed)
+        self.assertEqual('hello ann', next(results).result)
+        self.assertEqual(['prog greet ann'], consumed)
+
+    def test_without_actions(self):
+        cli = self.create_cli()
+
+        results = list(cli.parse_many(['prog greet ann'], with_actions=False))
+
+        self.assertIsNone(results[0].result)
+        self.assertEqual('ann', results[0].get_name())
+
+    def test_unfrozen_after_batch(self):
+        cli = self.create_cli()
+        list(cli.parse_many(['prog greet ann']))
+        self.assertFalse(cli.is_frozen())
+        cli.freeze()
+        list(cli.parse_many(['prog greet ann']))
+        self.assertTrue(cli.is_frozen())
+
+    def test_parsing_in_processes(self):
+        inputs = [f'prog greet name{i}' + (' -l' if i % 3 == 0 else '') for i in range(50)]
+        expected = [self.create_cli().parse(line).result for line in inputs]
+
+        snapshots = list(Cli.from_factory(create_greeting_cli).parse_many(inputs, processes=2, chunksize=4))
+
+        self.assertEqual(expected, [snapshot.result for snapshot in snapshots])
+        self.assertEqual('name7', snapshots[7].get_name())
+        self.assertEqual('greet', snapshots[7].node_name)
+
+    def test_parsing_in_processes_requires_factory(self):
+        with self.assertRaises(IncorrectStateError):
+            self.create_cli().parse_many(['prog greet ann'], processes=2)
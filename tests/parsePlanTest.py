@@ -0,0 +1,114 @@
+from parameterized import parameterized
+
+from smartcli import Cli, Root, ParsingException
+from smartcli.nodes.conditions import FlagActive
+from tests.abstractTest import AbstractTest
+
+
+class ParsePlanTest(AbstractTest):
+
+    def create_cli(self) -> Cli:
+        self.cli = Cli()
+        root = self.cli.root
+        root.add_flag('--verbose', '-v')
+        add = root.add_node('add', 'a')
+        add.set_possible_param_order('first second')
+        add.add_flag('--force', '-f')
+        first, second = add.get_params('first', 'second')
+        second.set_default('none')
+        add.add_action(lambda: f'{first.get()} {second.get()}')
+        return self.cli
+
+    def test_compiled_lookups(self):
+        root = Root()
+        flag = root.add_flag('--verbose', '-v')
+        node = root.add_node('add', 'a')
+
+        plan = root.compile()
+
+        self.assertIs(flag, plan.root.get_flag('-v'))
+        self.assertIs(node, plan.root.get_visible_node('a').node)
+        self.assertIs(plan.get_plan(node), plan.root.find_visible_node('add'))
+        self.assertIsNone(plan.root.find_visible_node('del'))
+
+    def test_plan_does_not_follow_later_changes(self):
+        root = Root()
+        plan = root.compile()
+        root.add_node('add')
+        root.add_flag('-v')
+
+        self.assertFalse(plan.root.has_visible_node('add'))
+        self.assertFalse(plan.root.has_flag('-v'))
+
+    @parameterized.expand([
+        ('main_name', 'prog add x y', 'x y'),
+        ('alternative_name', 'prog a x', 'x none'),
+        ('with_flags', 'prog -v add x -f y', 'x y'),
+    ])
+    def test_frozen_parsing_same_as_live(self, name, input_line, expected):
+        live = self.create_cli().parse(input_line).result
+        frozen_cli = self.create_cli()
+        frozen_cli.freeze()
+        frozen = frozen_cli.parse(input_line).result
+
+        self.assertEqual(expected, live)
+        self.assertEqual(live, frozen)
+        self.assertEqual('-f' in input_line, frozen_cli.root.get_node('add').get_flag('--force').is_active())
+
+    def test_nodes_added_after_freeze_are_parsed(self):
+        cli = self.create_cli()
+        plan = cli.freeze()
+        remove, every = cli.root.add_node('remove'), cli.root.add_flag('--all')
+        remove.add_hidden_node('one', action=lambda: 'removed').set_inactive_on_flags(every)
+        remove.add_hidden_node('all', action=lambda: 'removed all').set_active_on_flags(every)
+        verbose = cli.root.get_flag('-v')
+        cli.root.add_hidden_node('verbose', action=lambda: 'verbose').set_active(lambda: verbose.is_active())
+
+        self.assertEqual('removed', cli.parse('prog remove').result)
+        self.assertEqual('removed all', cli.parse('prog remove --all').result)
+        self.assertEqual('verbose', cli.parse('prog -v').result)
+        self.assertEqual('x none', cli.parse('prog add x').result)
+        self.assertIsNot(plan, cli.freeze())
+
+    def create_hidden_nodes_cli(self) -> Cli:
+        self.cli = Cli()
+        root = self.cli.root
+        word, meaning = root.add_flag('--word', '-w'), root.add_flag('--meaning', '-m')
+        root.add_hidden_node('single', action=lambda: 'single').set_inactive_on_flags(word, meaning)
+        root.add_hidden_node('words', action=lambda: 'words').set_active(FlagActive(word) & ~FlagActive(meaning))
+        root.add_hidden_node('meanings', action=lambda: 'meanings').set_active(FlagActive(meaning))
+        return self.cli
+
+    @parameterized.expand([
+        ('none', 'prog', 'single'),
+        ('word', 'prog -w', 'words'),
+        ('meaning', 'prog -m', 'meanings'),
+        ('both', 'prog -m -w', 'meanings'),
+    ])
+    def test_hidden_node_table(self, name, input_line, expected):
+        cli = self.create_hidden_nodes_cli()
+        table = cli.freeze(strict=True).root.get_hidden_table()
+
+        result = cli.parse(input_line).result
+
+        self.assertEqual(expected, result)
+        self.assertEqual(2, len(table.get_atoms()))
+
+    def test_hidden_node_ambiguity_found_when_compiling(self):
+        cli = self.create_hidden_nodes_cli()
+        cli.root.add_hidden_node('also_words', action=lambda: 'also').set_active_on_flags(cli.root.get_flag('-w'))
+
+        ambiguities = cli.freeze().get_ambiguities()
+
+        self.assertEqual({'root': {1: ('words', 'also_words'), 3: ('meanings', 'also_words')}}, {name: dict(table) for name, table in ambiguities.items()})
+        with self.assertRaises(ParsingException):
+            cli.freeze(strict=True)
+        with self.assertRaises(ParsingException):
+            cli.parse('prog -w')
+
+    def test_opaque_conditions_not_compiled(self):
+        cli = self.create_hidden_nodes_cli()
+        cli.root.add_hidden_node('opaque', active_condition=lambda: False)
+
+        self.assertIsNone(cli.freeze().root.get_hidden_table())
+        self.assertEqual('words', cli.parse('prog -w').result)
@@ -0,0 +1,63 @@
+from smartcli import Cli
+from tests.abstractTest import AbstractTest
+
+
+class ParsingResultTest(AbstractTest):
+
+    def create_cli(self) -> Cli:
+        self.cli = Cli()
+        self.calls = []
+        add = self.cli.root.add_node('add')
+        add.set_possible_param_order('first second')
+        first, second = add.get_params('first', 'second')
+        second.set_get_default(lambda: self.calls.append('second') or 'none')
+        add.add_action(lambda: self.calls.append('action') or f'{first.get()}')
+        return self.cli
+
+    def test_values_read_lazily_and_cached(self):
+        cli = self.create_cli()
+
+        result = cli.parse('prog add x')
+        self.calls.clear()
+
+        self.assertEqual('none', result.get_second())
+        self.assertEqual('none', result.get_second())
+        self.assertEqual(['second'], self.calls)
+
+    def test_values_of_previous_parse(self):
+        cli = self.create_cli()
+
+        first = cli.parse('prog add x y')
+        second = cli.parse('prog add z')
+
+        self.assertEqual(('x', 'y'), (first.get_first(), first.get_second()))
+        self.assertEqual(('z', 'none'), (second.get_first(), second.get_second()))
+
+    def test_as_dict(self):
+        cli = self.create_cli()
+
+        view = cli.parse('prog add x y').as_dict()
+
+        self.assertEqual({'first': 'x', 'second': 'y'}, dict(view))
+        self.assertEqual(['first', 'second'], list(view))
+        self.assertEqual('x', view['first'])
+        with self.assertRaises(KeyError):
+            view['third']
+
+    def test_slotted(self):
+        result = self.create_cli().parse('prog add x')
+
+        self.assertFalse(hasattr(result, '__dict__'))
+        with self.assertRaises(AttributeError):
+            result.other = 1
+
+    def test_type_created_once_per_node(self):
+        cli = self.create_cli()
+
+        first, second = cli.parse('prog add x'), cli.parse('prog add y')
+        cli.root.get_node('add').add_param('third')
+        third = cli.parse('prog add z')
+
+        self.assertIs(type(first), type(second))
+        self.assertIsNot(type(first), type(third))
+        self.assertTrue(hasattr(third, 'get_third'))
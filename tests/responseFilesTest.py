@@ -0,0 +1,80 @@
+import os
+import tempfile
+
+from parameterized import parameterized
+
+from smartcli import Cli
+from smartcli.exceptions import ParsingException
+from tests.abstractTest import AbstractTest
+
+
+class ResponseFilesTest(AbstractTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.dir.name, name)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def write_bytes(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.dir.name, name)
+        with open(path, 'wb') as file:
+            file.write(content)
+        return path
+
+    def create_cli(self, **kwargs) -> Cli:
+        self.cli = Cli()
+        self.files = self.cli.root.add_flag('--files', '-f', flag_limit=None)
+        self.cli.root.add_action(lambda: self.files.get_plain())
+        self.cli.enable_response_files(**kwargs)
+        return self.cli
+
+    def test_files_expanded(self):
+        names = [f'file{i}.txt' for i in range(1000)]
+        path = self.write('args', '-f\n' + '\n'.join(names) + '\n')
+
+        result = self.create_cli().parse(['prog', f'@{path}'])
+
+        self.assertEqual(names, result.result)
+
+    def test_quoted_and_nested(self):
+        inner = self.write('inner', '"with space.txt" \'single "quoted"\'')
+        outer = self.write('outer', f'a.txt @{inner} "escaped \\" quote"')
+
+        result = self.create_cli().parse(['prog', '-f', f'@{outer}', 'b.txt'])
+
+        self.assertEqual(['a.txt', 'with space.txt', 'single "quoted"', 'escaped " quote', 'b.txt'], result.result)
+
+    def test_tokens_built_of_adjacent_parts(self):
+        path = self.write('args', '--opt="a b" x \'c d\'e f\\ g')
+
+        result = self.create_cli().parse(['prog', '-f', f'@{path}'])
+
+        self.assertEqual(['--opt=a b', 'x', 'c de', 'f g'], result.result)
+
+    def test_empty_file_and_program_name(self):
+        empty = self.write('empty', '')
+
+        result = self.create_cli().parse(['@prog', '-f', f'@{empty}', 'a.txt'])
+
+        self.assertEqual(['a.txt'], result.result)
+
+    @parameterized.expand([
+        ('self_include', lambda t: t.write('loop', f'a @{os.path.join(t.dir.name, "loop")}'), {}),
+        ('too_deep', lambda t: t.write('second', f'@{t.write("first", "a")}'), {'max_depth': 1}),
+        ('too_big', lambda t: t.write('big', 'a' * 100), {'max_size': 10}),
+        ('missing', lambda t: os.path.join(t.dir.name, 'missing'), {}),
+        ('unclosed_quote', lambda t: t.write('unclosed', 'a "abc'), {}),
+        ('not_decodable', lambda t: t.write_bytes('latin', 'café'.encode('latin-1')), {}),
+    ])
+    def test_invalid_response_files(self, name, create_file, limits):
+        path = create_file(self)
+        cli = self.create_cli(**limits)
+
+        with self.assertRaises(ParsingException):
+            cli.parse(['prog', '-f', f'@{path}'])
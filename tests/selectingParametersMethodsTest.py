@@ -128,3 +128,31 @@ class SelectingParametersMethodsTest(AbstractTest):
 
     def test_variable_params_with_defaults(self):
         self.run_current_test_with_params()
+
+    def test_resolved_orders_are_reused(self):
+        cli = self.create_desactivational_cli_with_variable_parameter()
+        root = cli.root
+        computed = []
+        compute = root._compute_param_names_to_use
+        root._compute_param_names_to_use = lambda *args: computed.append(args[0]) or compute(*args)
+
+        results = [cli.parse(line).result for line in ('c - a b', 'c - c d', 'c - a b --no-end', 'c - c d --no-end')]
+        root.get_param('segments').set_lower_limit(1)
+        cli.parse('c - a b')
+
+        self.assertEqual(['ba', 'dc', 'a-b', 'c-d'], results)
+        self.assertEqual([3, 3, 3], computed)
+
+    def test_resolved_orders_kept_when_other_cli_changes(self):
+        cli, other = self.create_desactivational_cli_with_variable_parameter(), Cli()
+        root = cli.root
+        computed = []
+        compute = root._compute_param_names_to_use
+        root._compute_param_names_to_use = lambda *args: computed.append(args[0]) or compute(*args)
+
+        cli.parse('c - a b')
+        other.root.add_node('node').set_possible_param_order('x y')
+        other.root.add_flag('--flag').set_lower_limit(1)
+        cli.parse('c - a b')
+
+        self.assertEqual([3], computed)
@@ -0,0 +1,100 @@
+import random
+import shlex
+
+from parameterized import parameterized
+
+from smartcli import Cli, Root
+from smartcli.tokenizer import Tokenizer, TokenKind, split_args
+from tests.abstractTest import AbstractTest
+
+P, N, F, V = TokenKind.POSITIONAL, TokenKind.NODE, TokenKind.FLAG, TokenKind.FLAG_VALUE
+
+
+class TokenizerTest(AbstractTest):
+
+    def create_root(self) -> Root:
+        root = Root()
+        root.add_flag('--single', '-s', flag_limit=0)
+        root.add_flag('--word', '-w', flag_limit=None)
+        root.add_flag('--from', storage_limit=1)
+        add = root.add_node('add')
+        add.add_flag('--word', flag_limit=1)
+        return root
+
+    @parameterized.expand([
+        ('only_positionals', 'prog a b', [N, P, P]),
+        ('flag_without_values', 'prog a -s b', [N, P, F, P]),
+        ('multi_valued_flag', 'prog -w a b c', [N, F, V, V, V]),
+        ('limited_flag_overflow', 'prog --from a b', [N, F, V, P]),
+        ('flags_one_after_another', 'prog -w a --from b c -s d', [N, F, V, F, V, P, F, P]),
+        ('flag_shadowed_by_met_node', 'prog add --word a', [N, P, P, P]),
+    ])
+    def test_root_flags_classification(self, name, input_line, expected):
+        tokenizer = Tokenizer(input_line.split(' '))
+
+        tokenizer.classify_flags(self.create_root())
+
+        self.assertEqual(expected, [tokenizer.get_kind(i) for i in range(len(tokenizer))])
+
+    def test_spans_and_args(self):
+        tokenizer = Tokenizer('prog x -w a b --from c d e'.split(' '))
+
+        tokenizer.classify_flags(self.create_root())
+
+        self.assertEqual([(1, 2), (7, 9)], list(tokenizer.get_spans(P)))
+        self.assertEqual(['x', 'd', 'e'], tokenizer.get_args(P))
+        self.assertEqual(['a', 'b', 'c'], tokenizer.get_args(V))
+
+    def test_values_reach_flags(self):
+        root = self.create_root()
+        Tokenizer('prog -w a b --from c'.split(' ')).classify_flags(root)
+
+        self.assertEqual(['a', 'b'], root.get_flag('-w').get_plain())
+        self.assertEqual('c', root.get_flag('--from').get())
+        self.assertTrue(root.get_flag('-w').is_active())
+
+    def test_flag_of_action_node_among_positionals(self):
+        cli = Cli(root=self.create_root())
+        add = cli.root.get_node('add')
+        add.set_possible_param_order('name')
+        add.add_action(lambda name: name)
+
+        result = cli.parse('prog add --word x -s name')
+
+        self.assertEqual('name', result.result)
+        self.assertEqual('x', add.get_flag('--word').get())
+
+    @parameterized.expand([
+        ('plain', 'prog a  b\tc\n'),
+        ('empty', ''),
+        ('only_spaces', ' \t '),
+        ('other_whitespaces', 'a\x0bb\xa0c'),
+        ('single_quotes', "prog 'a b' 'it\\'"),
+        ('double_quotes', 'prog "a b" "x\\"y" "\\a\\\\"'),
+        ('empty_quotes', "prog '' \"\""),
+        ('concatenated', 'prog a"b c"d\'e f\'g'),
+        ('escapes', 'prog a\\ b \\\\ \\"q'),
+        ('escaped_newline', 'prog a\\\nb'),
+        ('no_comments', 'prog # a'),
+        ('unicode', 'prog żółw "ąę ść"'),
+        ('unclosed_single', "prog 'a"),
+        ('unclosed_double', 'prog "a'),
+        ('trailing_backslash', 'prog a\\'),
+        ('trailing_backslash_in_double', 'prog "a\\'),
+    ])
+    def test_split_args_like_shlex(self, name, line):
+        self.assertEqual(self.split_with(shlex.split, line), self.split_with(split_args, line))
+
+    def test_split_args_like_shlex_on_random_lines(self):
+        rng = random.Random(0)
+        alphabet = 'ab \t\n"\'\\#ż\x0b'
+        for _ in range(2000):
+            line = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+            self.assertEqual(self.split_with(shlex.split, line), self.split_with(split_args, line), repr(line))
+
+    @staticmethod
+    def split_with(split, line: str) -> tuple:
+        try:
+            return 'ok', split(line)
+        except ValueError as e:
+            return 'error', str(e)